@@ -1,2 +1,3 @@
 from augmentex.char import CharAug
 from augmentex.word import WordAug
+from augmentex.monitor import AugMonitor
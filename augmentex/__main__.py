@@ -0,0 +1,59 @@
+import argparse
+from typing import List, Union
+
+from augmentex.variables import CHAR_BACKENDS
+
+
+def main(argv: Union[List[str], None] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="augmentex", description="Augmentex — a library for augmenting texts with errors")
+    subparsers = parser.add_subparsers(dest="command")
+
+    serve_parser = subparsers.add_parser(
+        "serve", help="Run a local augmentation server with dynamic micro-batching.")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8000)
+    serve_parser.add_argument("--unix-socket", default=None,
+                              help="Listen on a Unix socket instead of TCP.")
+    serve_parser.add_argument("--max-batch-size", type=int, default=256,
+                              help="Maximum number of texts in a micro-batch.")
+    serve_parser.add_argument("--max-latency-ms", type=float, default=5.0,
+                              help="Maximum time to wait for more requests after the first one.")
+    serve_parser.add_argument("--preload", nargs="*", default=[],
+                              help="Augmenters to create at start, e.g. char:rus:pc word:eng:pc.")
+    serve_parser.add_argument("--unit-prob", type=float, default=0.3)
+    serve_parser.add_argument("--min-aug", type=int, default=1)
+    serve_parser.add_argument("--max-aug", type=int, default=5)
+    serve_parser.add_argument("--random-seed", type=int, default=None)
+    serve_parser.add_argument("--backend", choices=CHAR_BACKENDS, default="python")
+    serve_parser.add_argument("--correct-texts-path", default=None)
+    serve_parser.add_argument("--error-texts-path", default=None)
+    serve_parser.add_argument("--verbose", action="store_true",
+                              help="Log every request.")
+
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        from augmentex.server import serve
+
+        serve(
+            host=args.host,
+            port=args.port,
+            unix_socket=args.unix_socket,
+            max_batch_size=args.max_batch_size,
+            max_latency=args.max_latency_ms / 1000,
+            preload=args.preload,
+            verbose=args.verbose,
+            unit_prob=args.unit_prob,
+            min_aug=args.min_aug,
+            max_aug=args.max_aug,
+            random_seed=args.random_seed,
+            backend=args.backend,
+            correct_texts_path=args.correct_texts_path,
+            error_texts_path=args.error_texts_path,
+        )
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
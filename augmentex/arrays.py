@@ -0,0 +1,168 @@
+import importlib.util
+from typing import List, Sequence, Tuple, Union
+
+import numpy as np
+
+# pyarrow is imported only when an Arrow batch arrives, it is slow to import.
+PYARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+Batch = Union[List[str], np.ndarray, "pa.Array", "pa.ChunkedArray"]
+
+
+def _is_arrow(batch: Batch) -> bool:
+    """Detects Arrow objects without importing pyarrow."""
+    return type(batch).__module__.split(".")[0] == "pyarrow"
+
+
+def _is_string_view(data_type) -> bool:
+    """Checks for the Arrow string_view type, which has no take and replace kernels.
+
+    Args:
+        data_type (pa.DataType): Arrow type.
+
+    Returns:
+        bool: True for string_view.
+    """
+    import pyarrow as pa
+
+    return hasattr(pa.types, "is_string_view") and pa.types.is_string_view(data_type)
+
+
+def _check_batch(batch: Batch) -> None:
+    """Checks that the batch holds strings.
+
+    Args:
+        batch (Batch): List of lines, NumPy array of str, object or StringDType dtype, or Arrow array of strings.
+    """
+    if _is_arrow(batch):
+        import pyarrow as pa
+
+        if not isinstance(batch, (pa.Array, pa.ChunkedArray)):
+            raise ValueError(
+                f"Augmentex support only Arrow arrays of strings. You put {type(batch).__name__}.")
+        string_types = [pa.types.is_string, pa.types.is_large_string]
+        if hasattr(pa.types, "is_string_view"):
+            string_types.append(pa.types.is_string_view)
+        if not any(is_type(batch.type) for is_type in string_types):
+            raise ValueError(
+                f"Augmentex support only Arrow arrays of strings. You put {batch.type}.")
+    elif isinstance(batch, np.ndarray):
+        if batch.ndim != 1 or batch.dtype.kind not in "UOT":
+            raise ValueError(
+                f"Augmentex support only 1-d NumPy arrays of strings. You put {batch.ndim}-d array of {batch.dtype}.")
+
+
+def take_rows(batch: Batch, idxs: Sequence[int]) -> Tuple[List[int], List[str]]:
+    """Converts only the selected rows of the batch to Python strings.
+
+    Args:
+        batch (Batch): List of lines, NumPy array of strings or Arrow array of strings.
+        idxs (Sequence[int]): Indices of rows.
+
+    Returns:
+        Tuple[List[int], List[str]]: Indices and lines of the selected rows. Missing rows (None or null) are skipped.
+    """
+    _check_batch(batch)
+    if _is_arrow(batch):
+        import pyarrow as pa
+
+        if _is_string_view(batch.type):
+            batch = batch.cast(pa.string())
+        lines = batch.take(pa.array(idxs, type=pa.int64())).to_pylist()
+    elif isinstance(batch, np.ndarray):
+        lines = batch[np.asarray(idxs, dtype=np.int64)].tolist()
+    else:
+        lines = [batch[idx] for idx in idxs]
+
+    idxs = list(idxs)
+    if None in lines:
+        kept = [i for i, line in enumerate(lines) if line is not None]
+        idxs = [idxs[i] for i in kept]
+        lines = [lines[i] for i in kept]
+
+    return idxs, lines
+
+
+def replace_rows(batch: Batch, idxs: Sequence[int], lines: Sequence[str]) -> Batch:
+    """Returns a new batch of the same type with the selected rows replaced.
+
+    Untouched rows are not converted to Python strings. Lists and NumPy arrays of objects keep
+    references to untouched lines. Arrow chunks without replaced rows are reused as is, other
+    chunks are rewritten with a single C-level pass.
+
+    Args:
+        batch (Batch): List of lines, NumPy array of strings or Arrow array of strings.
+        idxs (Sequence[int]): Indices of rows.
+        lines (Sequence[str]): New lines of these rows.
+
+    Returns:
+        Batch: Batch with replaced rows.
+    """
+    if _is_arrow(batch):
+        return _replace_arrow(batch, idxs, lines)
+
+    if isinstance(batch, np.ndarray):
+        if batch.dtype.kind == "U":
+            # Fixed-width strings are widened, so that longer lines are not truncated.
+            width = max([len(line) for line in lines], default=0)
+            aug_batch = batch.astype(np.result_type(batch.dtype, f"<U{width}"))
+        else:
+            aug_batch = batch.copy()
+        if len(idxs):
+            aug_batch[np.asarray(idxs, dtype=np.int64)] = np.array(
+                lines, dtype=aug_batch.dtype)
+        return aug_batch
+
+    aug_batch = batch.copy()
+    for idx, line in zip(idxs, lines):
+        aug_batch[idx] = line
+
+    return aug_batch
+
+
+def _replace_arrow(batch: Batch, idxs: Sequence[int], lines: Sequence[str]) -> Batch:
+    """Replaces rows of an Arrow array, chunk by chunk.
+
+    Args:
+        batch (Batch): Arrow array or chunked array of strings.
+        idxs (Sequence[int]): Indices of rows.
+        lines (Sequence[str]): New lines of these rows.
+
+    Returns:
+        Batch: Arrow array of the same type.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if len(idxs) == 0:
+        return batch
+
+    order = np.argsort(np.asarray(idxs, dtype=np.int64), kind="stable")
+    idxs = np.asarray(idxs, dtype=np.int64)[order]
+    lines = [lines[i] for i in order]
+
+    chunked = isinstance(batch, pa.ChunkedArray)
+    chunks = batch.chunks if chunked else [batch]
+    aug_chunks = []
+    start, pos = 0, 0
+    for chunk in chunks:
+        end = start + len(chunk)
+        stop = int(np.searchsorted(idxs, end))
+        if stop > pos:
+            mask = np.zeros(len(chunk), dtype=bool)
+            mask[idxs[pos:stop] - start] = True
+            # string_view chunks are replaced as string and cast back.
+            view_type = chunk.type if _is_string_view(chunk.type) else None
+            if view_type is not None:
+                chunk = chunk.cast(pa.string())
+            chunk = pc.replace_with_mask(chunk, pa.array(mask), pa.array(
+                lines[pos:stop], type=chunk.type))
+            if view_type is not None:
+                chunk = chunk.cast(view_type)
+        aug_chunks.append(chunk)
+        start, pos = end, stop
+
+    if chunked:
+        return pa.chunked_array(aug_chunks, type=batch.type)
+
+    return aug_chunks[0]
@@ -1,15 +1,34 @@
 import random
 import json
+import threading
 from abc import ABC, abstractmethod
-from typing import List, Union, Dict
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Any, List, Sequence, Tuple, Union, Dict
 
 import numpy as np
 
+from augmentex.arrays import Batch, replace_rows, take_rows
+from augmentex.monitor import AugMonitor
 from augmentex.variables import SUPPORT_LANGUAGES, SUPPORT_PLATFORMS
 
 
 class BaseAug(ABC):
-    def __init__(self, min_aug: int = 1, max_aug: int = 5, random_seed: int = None, lang: str = "rus", platform: str = "pc") -> None:
+    """Base class of augmenters.
+
+    Instances are thread-safe: statistics are read-only after construction and
+    every thread draws from its own random state.
+    """
+
+    def __init__(
+        self,
+        min_aug: int = 1,
+        max_aug: int = 5,
+        random_seed: int = None,
+        lang: str = "rus",
+        platform: str = "pc",
+        monitor: Union[AugMonitor, None] = None,
+    ) -> None:
         """
         Args:
             min_aug (int, optional): The minimum amount of augmentation. Defaults to 1.
@@ -17,15 +36,19 @@ class BaseAug(ABC):
             random_seed (int, optional): Random seed. Default to None.
             lang (str, optional): Language of texts. Default to 'rus'.
             platform (str, optional): Type of platform where statistic was collected. Defaults to 'pc'.
+            monitor (AugMonitor, optional): Monitor of the augmentation strength. Defaults to None.
         """
         self.min_aug = min_aug
         self.max_aug = max_aug
         self.random_seed = random_seed
         self.lang = lang
         self.platform = platform
+        self.monitor = monitor
 
-        if self.random_seed:
-            self.__fix_random_seed(self.random_seed)
+        self.__local = threading.local()
+        self.__seed_lock = threading.Lock()
+        self.__seed_count = 0
+        self.__init_random_state()
 
         if self.lang not in SUPPORT_LANGUAGES:
             raise ValueError(
@@ -50,14 +73,107 @@ class BaseAug(ABC):
 
         return data
 
-    def __fix_random_seed(self, random_seed: int) -> None:
-        """Fixing random seed.
+    def _freeze(self, data: Any) -> Any:
+        """Makes loaded statistics read-only, so they can be shared between threads.
+
+        Args:
+            data (Any): Data loaded from JSON.
+
+        Returns:
+            Any: The same data with dicts as mapping proxies and lists as tuples.
+        """
+        if isinstance(data, dict):
+            return MappingProxyType({k: self._freeze(v) for k, v in data.items()})
+        if isinstance(data, list):
+            return tuple(self._freeze(v) for v in data)
+
+        return data
+
+    def __thaw(self, data: Any) -> Any:
+        """Turns mapping proxies back into dicts, so the data can be pickled.
+
+        Args:
+            data (Any): Frozen data.
+
+        Returns:
+            Any: Data without mapping proxies.
+        """
+        if isinstance(data, MappingProxyType):
+            return {k: self.__thaw(v) for k, v in data.items()}
+        if isinstance(data, tuple):
+            return tuple(self.__thaw(v) for v in data)
+
+        return data
+
+    def __getstate__(self) -> Dict:
+        state = {k: self.__thaw(v) for k, v in self.__dict__.items()}
+        for name in ["local", "seed_lock", "seed_count"]:
+            del state[f"_BaseAug__{name}"]
+        # Only the statistics frozen in __init__ are frozen again, user's dicts stay as they are.
+        state["_BaseAug__frozen"] = [k for k, v in self.__dict__.items()
+                                     if isinstance(v, MappingProxyType)]
+
+        return state
+
+    def __setstate__(self, state: Dict) -> None:
+        state = dict(state)
+        frozen = set(state.pop("_BaseAug__frozen", []))
+        self.__dict__.update(
+            {k: self._freeze(v) if k in frozen else v for k, v in state.items()})
+        self.__local = threading.local()
+        self.__seed_lock = threading.Lock()
+        self.__seed_count = 0
+        self.__init_random_state()
+
+    def __init_random_state(self) -> None:
+        """Creates the random state of the current thread.
+
+        The first thread (the one that creates the augmenter) is seeded with `random_seed` itself,
+        other threads get seeds derived from `random_seed` and the order in which they start.
+        """
+        with self.__seed_lock:
+            thread_count = self.__seed_count
+            self.__seed_count += 1
+
+        if self.random_seed is None:
+            seed = None
+        elif thread_count == 0:
+            seed = self.random_seed
+        else:
+            seed = int(np.random.SeedSequence(
+                [self.random_seed, thread_count]).generate_state(1)[0])
+        self._seed_thread(seed)
+
+    def _seed_thread(self, seed: Union[int, None]) -> None:
+        """Replaces the random state of the current thread.
 
         Args:
-            random_seed (int): Integer digit.
+            seed (Union[int, None]): Random seed. If None, the state is seeded from OS entropy.
         """
-        random.seed(random_seed)
-        np.random.seed(random_seed)
+        self.__local.random = random.Random(seed)
+        self.__local.np_random = np.random.RandomState(seed)
+
+    @property
+    def _random(self) -> random.Random:
+        """
+        Returns:
+            random.Random: Python random state of the current thread.
+        """
+        if not hasattr(self.__local, "random"):
+            self.__init_random_state()
+
+        return self.__local.random
+
+    @property
+    def _np_random(self) -> np.random.RandomState:
+        """
+        Returns:
+            np.random.RandomState: NumPy random state of the current thread.
+        """
+        if not hasattr(self.__local, "np_random"):
+            self.__init_random_state()
+
+        return self.__local.np_random
 
     def __augs_count(self, size: int, rate: float) -> int:
         """Counts the number of augmentations and performs circumcision by the maximum or minimum number.
@@ -85,8 +201,8 @@ class BaseAug(ABC):
         Returns:
             List[int]: List of indices.
         """
-        token_idxes = [i for i in range(len(inputs))]
-        aug_idxs = random.sample(token_idxes, aug_count)
+        # Sampling from a range gives the same indices as from a list, without building it.
+        aug_idxs = self._random.sample(range(len(inputs)), aug_count)
 
         return aug_idxs
 
@@ -97,7 +213,7 @@ class BaseAug(ABC):
         Args:
             inputs (List[str]): List of units.
             rate (float): The percentage of units to which augmentation will be applied.
-            clip (bool): Takes into account the maximum and minimum values. Defaults to False.
+            clip (bool): Takes into account the maximum and minimum values. The amount never exceeds the number of units. Defaults to False.
 
         Returns:
             List[int]: List of indices.
@@ -105,35 +221,176 @@ class BaseAug(ABC):
         aug_count = self.__augs_count(len(inputs), rate)
         if clip:
             aug_count = max(aug_count, self.min_aug)
-            aug_count = min(aug_count, self.max_aug)
+            aug_count = min(aug_count, self.max_aug, len(inputs))
 
         aug_idxs = self.__get_random_idx(inputs, aug_count)
 
         return aug_idxs
 
+    def _new_edit_log(self, lines: bool = False) -> Dict[str, list]:
+        """Creates an empty edit log, collected in lists until it is returned.
+
+        Args:
+            lines (bool, optional): Also collect the "line" of each edit. Defaults to False.
+
+        Returns:
+            Dict[str, list]: Empty edit log.
+        """
+        keys = ["line"] if lines else []
+        keys += ["position", "original", "replacement", "action"]
+
+        return {key: [] for key in keys}
+
+    def _log_edits(self, edits: Dict[str, list], units: Sequence[str], aug_units: Union[Sequence[str], Dict[int, str]],
+                   touched: Dict[int, str]) -> None:
+        """Appends the units changed by the applied actions to the edit log.
+
+        Args:
+            edits (Dict[str, list]): Edit log being collected.
+            units (Sequence[str]): Original units (chars or words).
+            aug_units (Union[Sequence[str], Dict[int, str]]): The same units after augmentation, or only the touched ones by their index.
+            touched (Dict[int, str]): Index of each touched unit and the last action applied to it.
+        """
+        positions, originals = edits["position"], edits["original"]
+        replacements, actions = edits["replacement"], edits["action"]
+        for idx in sorted(touched):
+            unit, aug_unit = units[idx], aug_units[idx]
+            if unit != aug_unit:
+                positions.append(idx)
+                originals.append(unit)
+                replacements.append(aug_unit)
+                actions.append(touched[idx])
+
+    def _edit_arrays(self, edits: Dict[str, list]) -> Dict[str, np.ndarray]:
+        """Turns the collected edit log into arrays. A log with lines is sorted by line.
+
+        Args:
+            edits (Dict[str, list]): Edit log being collected.
+
+        Returns:
+            Dict[str, np.ndarray]: Edit log, see `augment`.
+        """
+        arrays = {}
+        for key, values in edits.items():
+            dtype = np.int64 if key in ["line", "position"] else object
+            arrays[key] = np.array(values, dtype=dtype)
+        if "line" in arrays:
+            order = np.argsort(arrays["line"], kind="stable")
+            arrays = {key: values[order] for key, values in arrays.items()}
+
+        return arrays
+
     def aug_batch(
         self,
-        batch: List[str],
+        batch: Batch,
         batch_prob: float = 1.0,
         action: Union[None, str] = None,
-    ) -> List[str]:
+        num_threads: int = 1,
+        return_edits: bool = False,
+    ) -> Union[Batch, Tuple[Batch, Dict[str, np.ndarray]]]:
         """The use of augmentation to several lines
 
         Args:
-            batch (List[str]): List of lines for augmentation.
+            batch (Batch): List of lines for augmentation, a 1-d NumPy array of strings or an Arrow array of strings. Only selected lines are converted to Python strings.
             batch_prob (float, optional): The percentage of units to which augmentation will be applied. Defaults to 1.0.
             action (Union[None, str], optional): Indicates what action will be applied. Defaults to None. If None, then a random action is chosen.
+            num_threads (int, optional): Number of threads to augment lines in. With a fixed random seed the result is reproducible for the same number of threads. Defaults to 1.
+            return_edits (bool, optional): Also return the edit log of the batch, see `augment`. It has an extra "line" array with the index of the line of each edit and is sorted by line. Defaults to False.
+
+        Returns:
+            Union[Batch, Tuple[Batch, Dict[str, np.ndarray]]]: Augmented lines of the same type as `batch` and, if `return_edits`, the edit log. Missing lines (None or null) are kept as is.
+        """
+        aug_idxs = self._aug_indexing(batch, batch_prob)
+        aug_idxs, lines = take_rows(batch, aug_idxs)
+        if num_threads > 1 and len(lines) > 1:
+            chunks = np.array_split(np.arange(len(lines)),
+                                    min(num_threads, len(lines)))
+            # The default int dtype is 32-bit on Windows with NumPy < 2, too small for 2 ** 32.
+            seeds = self._np_random.randint(
+                0, 2 ** 32, size=len(chunks), dtype=np.uint32)
+            with ThreadPoolExecutor(max_workers=len(chunks)) as pool:
+                aug_chunks = list(pool.map(
+                    lambda chunk, seed: self.__aug_chunk(lines, aug_idxs, chunk.tolist(), int(seed), action, return_edits),
+                    chunks, seeds))
+            aug_lines = []
+            edits = self._new_edit_log(lines=True) if return_edits else None
+            for chunk_lines, chunk_edits in aug_chunks:
+                aug_lines.extend(chunk_lines)
+                if edits is not None:
+                    for key, values in chunk_edits.items():
+                        edits[key].extend(values)
+        else:
+            edits = self._new_edit_log(lines=True) if return_edits else None
+            aug_lines = self.__aug_lines(
+                lines, aug_idxs, range(len(lines)), action, edits)
+
+        if return_edits:
+            return replace_rows(batch, aug_idxs, aug_lines), self._edit_arrays(edits)
+
+        return replace_rows(batch, aug_idxs, aug_lines)
+
+    def __aug_lines(self, lines: List[str], line_idxs: List[int], positions: Sequence[int], action: Union[None, str],
+                    edits: Union[Dict[str, list], None] = None) -> List[str]:
+        """Augments the selected lines one by one.
+
+        Args:
+            lines (List[str]): Lines selected for augmentation.
+            line_idxs (List[int]): Index of each of these lines in the batch.
+            positions (Sequence[int]): Positions of lines to augment in `lines`.
+            action (Union[None, str]): Indicates what action will be applied.
+            edits (Dict[str, list], optional): If passed, edits are appended to this log with their line. Defaults to None.
+
+        Returns:
+            List[str]: Augmented lines.
+        """
+        aug_lines = []
+        for pos in positions:
+            aug_lines.append(self._augment(lines[pos], action, edits))
+            if edits is not None:
+                edits["line"].extend(
+                    [line_idxs[pos]] * (len(edits["position"]) - len(edits["line"])))
+
+        return aug_lines
+
+    def __aug_chunk(self, lines: List[str], line_idxs: List[int], positions: List[int], seed: int, action: Union[None, str],
+                    return_edits: bool = False) -> Tuple[List[str], Union[Dict[str, list], None]]:
+        """Augments a part of the batch in a worker thread.
+
+        Args:
+            lines (List[str]): Lines selected for augmentation.
+            line_idxs (List[int]): Index of each of these lines in the batch.
+            positions (List[int]): Positions of lines of this part in `lines`.
+            seed (int): Random seed of the part.
+            action (Union[None, str]): Indicates what action will be applied.
+            return_edits (bool, optional): Also collect the edit log of the part. Defaults to False.
+
+        Returns:
+            Tuple[List[str], Union[Dict[str, list], None]]: Augmented lines and the collected edit log, if `return_edits`.
+        """
+        self._seed_thread(seed)
+        edits = self._new_edit_log(lines=True) if return_edits else None
+
+        return self.__aug_lines(lines, line_idxs, positions, action, edits), edits
+
+    def augment(self, text: str, action: Union[None, str] = None,
+                return_edits: bool = False) -> Union[str, Tuple[str, Dict[str, np.ndarray]]]:
+        """Modifies the text according to the action.
+
+        Args:
+            text (str): Text phrase.
+            action (Union[None, str], optional): The action to apply. Defaults to None.
+            return_edits (bool, optional): Also return the edit log. Defaults to False.
 
         Returns:
-            List[str]: List of augmented lines.
+            Union[str, Tuple[str, Dict[str, np.ndarray]]]: Modified text and, if `return_edits`, the edit log.
         """
-        aug_batch = batch.copy()
-        aug_idxs = self._aug_indexing(aug_batch, batch_prob)
-        for idx in aug_idxs:
-            aug_batch[idx] = self.augment(aug_batch[idx], action)
+        edits = self._new_edit_log() if return_edits else None
+        aug_text = self._augment(text, action, edits)
+        if return_edits:
+            return aug_text, self._edit_arrays(edits)
 
-        return aug_batch
+        return aug_text
 
     @abstractmethod
-    def augment(self, text, action):
+    def _augment(self, text, action, edits=None):
         pass
@@ -1,11 +1,17 @@
 import os
-from typing import List, Union
+import warnings
+from collections import abc
+from functools import partial
+from typing import Dict, List, Mapping, Tuple, Union
 
 import numpy as np
 
 from augmentex.base import BaseAug
+from augmentex.compaction import compact_char_statistic
+from augmentex.kernels import SPARSE_EDIT_RATIO, CharKernel
+from augmentex.monitor import AugMonitor
 from augmentex.preprocessor import ComputeStatistic
-from augmentex.variables import CHAR_ACTIONS
+from augmentex.variables import CHAR_ACTIONS, CHAR_BACKENDS, MULTIPLY_SKIP_CHARS
 
 
 class CharAug(BaseAug):
@@ -22,6 +28,11 @@ class CharAug(BaseAug):
         platform: str = "pc",
         correct_texts_path: Union[str, None] = None,
         error_texts_path: Union[str, None] = None,
+        action_weights: Union[Mapping[str, float], None] = None,
+        backend: str = "python",
+        monitor: Union[AugMonitor, None] = None,
+        top_k: Union[int, None] = None,
+        prob_mass: Union[float, None] = None,
     ) -> None:
         """
         Args:
@@ -34,28 +45,62 @@ class CharAug(BaseAug):
             platform (str, optional): Type of platform where statistic was collected. Defaults to 'pc'.
             correct_texts_path (str, optional): Path to txt file with correct texts. Defaults to None.
             error_texts_path (str, optional): Path to txt file with error texts. Default to None.
+            action_weights (Mapping[str, float], optional): Weights of actions used when no action is passed. If set, each selected position gets its own action. Defaults to None.
+            backend (str, optional): Engine that applies the edits, 'python' or 'numba'. Falls back to 'python' if numba is unavailable. Defaults to 'python'.
+            monitor (AugMonitor, optional): Monitor of the augmentation strength. Defaults to None.
+            top_k (int, optional): Keep only the top-k most probable replacements of each char in the orfo statistics. Defaults to None.
+            prob_mass (float, optional): Keep only the most probable replacements of each char that cover this probability mass. Defaults to None.
         """
         super().__init__(min_aug=min_aug, max_aug=max_aug,
-                         random_seed=random_seed, lang=lang, platform=platform)
+                         random_seed=random_seed, lang=lang, platform=platform, monitor=monitor)
         dir_path = os.path.dirname(os.path.abspath(__file__))
 
-        self.typo_dict = self._read_json(os.path.join(
-            dir_path, "static_data", f"{self.platform}_typos_chars.json"))
-        self.shift_dict = self._read_json(
-            os.path.join(dir_path, "static_data", "shift.json"))
-        self.vocab = self._read_json(os.path.join(
-            dir_path, "static_data", self.lang, "vocab.json"))
+        self.typo_dict = self._freeze(self._read_json(os.path.join(
+            dir_path, "static_data", f"{self.platform}_typos_chars.json")))
+        self.shift_dict = self._freeze(self._read_json(
+            os.path.join(dir_path, "static_data", "shift.json")))
+        self.vocab = self._freeze(self._read_json(os.path.join(
+            dir_path, "static_data", self.lang, "vocab.json")))
 
         if correct_texts_path is not None or error_texts_path is not None:
             cs = ComputeStatistic(correct_texts_path,
                                   error_texts_path, self.lang)
-            self.orfo_dict = cs.compute_char_statistic()
+            orfo_dict = cs.compute_char_statistic()
         else:
-            self.orfo_dict = self._read_json(os.path.join(
+            orfo_dict = self._read_json(os.path.join(
                 dir_path, "static_data", self.lang, self.platform, "orfo_chars.json"))
+        self.orfo_dict = self._freeze(
+            compact_char_statistic(orfo_dict, top_k, prob_mass))
 
         self.mult_num = mult_num
         self.unit_prob = unit_prob
+        self.action_weights = action_weights
+        self.__action_mix = None
+        if self.action_weights is not None:
+            self.__action_mix = self.__normalize_weights(self.action_weights)
+
+        self.__orfo_cdf = {}
+        for char, (idxs, probas) in self.orfo_dict.items():
+            cdf = np.cumsum(probas)
+            cdf = cdf / cdf[-1]
+            idxs.flags.writeable = False
+            cdf.flags.writeable = False
+            self.__orfo_cdf[char] = (idxs, cdf)
+        self.__orfo_cdf = self._freeze(self.__orfo_cdf)
+
+        if backend not in CHAR_BACKENDS:
+            raise ValueError(
+                f"""Augmentex support only {', '.join(CHAR_BACKENDS)} backends.
+                You put {backend}.""")
+        self.backend = backend
+        self.__kernel = None
+        if self.backend == "numba":
+            try:
+                self.__kernel = CharKernel(
+                    self.typo_dict, self.shift_dict, self.__orfo_cdf, self.vocab, self.mult_num)
+            except (ImportError, ValueError, RuntimeError) as e:
+                warnings.warn(f"{e} Falling back to the python backend.")
+                self.backend = "python"
 
     @property
     def actions_list(self) -> List[str]:
@@ -66,24 +111,27 @@ class CharAug(BaseAug):
 
         return CHAR_ACTIONS
 
-    def __typo(self, char: str) -> str:
+    def __typo(self, char: str, u: float) -> str:
         """A method that simulates a typo by an adjacent key.
 
         Args:
             char (str): A symbol from the word.
+            u (float): Uniform random number in [0, 1).
 
         Returns:
             str: A new symbol.
         """
-        typo_char = np.random.choice(self.typo_dict.get(char, [char]))
+        typo_chars = self.typo_dict.get(char, [char])
+        typo_char = typo_chars[int(u * len(typo_chars))]
 
         return typo_char
 
-    def __shift(self, char: str) -> str:
+    def __shift(self, char: str, u: float) -> str:
         """Changes the case of the symbol.
 
         Args:
             char (str): A symbol from the word.
+            u (float): Uniform random number in [0, 1). Not used.
 
         Returns:
             str: The same character but with a different case.
@@ -92,60 +140,137 @@ class CharAug(BaseAug):
 
         return shift_char
 
-    def __orfo(self, char: str) -> str:
+    def __orfo(self, char: str, u: float) -> str:
         """Changes the symbol depending on the error statistics.
 
         Args:
             char (str): A symbol from the word.
+            u (float): Uniform random number in [0, 1).
 
         Returns:
             str: A new symbol.
         """
-        if self.orfo_dict.get(char, None) == None:
+        if char not in self.__orfo_cdf:
             orfo_char = char
         else:
-            orfo_char = np.random.choice(
-                self.vocab, p=self.orfo_dict.get(char, None)
-            )
+            idxs, cdf = self.__orfo_cdf[char]
+            orfo_char = self.vocab[idxs[np.searchsorted(
+                cdf, u, side="right")]]
 
         return orfo_char
 
-    def __delete(self) -> str:
+    def __delete(self, char: str, u: float) -> str:
         """Deletes a random character.
 
+        Args:
+            char (str): A symbol from the word.
+            u (float): Uniform random number in [0, 1). Not used.
+
         Returns:
             str: Empty string.
         """
 
         return ""
 
-    def __insert(self, char: str) -> str:
+    def __insert(self, char: str, u: float) -> str:
         """Inserts a random character.
 
         Args:
             char (str): A symbol from the word.
+            u (float): Uniform random number in [0, 1).
 
         Returns:
             str: A symbol + new symbol.
         """
 
-        return char + np.random.choice(self.vocab)
+        return char + self.vocab[int(u * len(self.vocab))]
 
-    def __multiply(self, char: str) -> str:
+    def __multiply(self, char: str, u: float) -> str:
         """Repeats a randomly selected character.
 
         Args:
             char (str): A symbol from the word.
+            u (float): Uniform random number in [0, 1).
 
         Returns:
             str: A symbol from the word matmul n times.
         """
-        if char in [" ", ",", ".", "?", "!", "-"]:
+        if char in MULTIPLY_SKIP_CHARS:
             return char
         else:
-            n = np.random.randint(1, self.mult_num)
+            n = 1 + int(u * (self.mult_num - 1))
             return char * n
 
+    def __swap(self, text: str, overlay: Dict[int, str], idx: int) -> None:
+        """Swaps the symbol with the previous one in the overlay.
+
+        Args:
+            text (str): Original text.
+            overlay (Dict[int, str]): Edited symbols by their index in the text.
+            idx (int): Index of the symbol.
+        """
+        sw = max(0, idx - 1)
+        overlay[sw], overlay[idx] = (
+            overlay.get(idx, text[idx]),
+            overlay.get(sw, text[sw]),
+        )
+
+    def __check_action(self, action: str) -> None:
+        """Checks that the action is available.
+
+        Args:
+            action (str): Name of the action.
+        """
+        if action not in CHAR_ACTIONS:
+            raise NameError(
+                """These type of augmentation is not available, please try TypoAug.actions_list() to see
+                available augmentations"""
+            )
+
+    def __normalize_weights(self, action_weights: Mapping[str, float]) -> Tuple[np.ndarray, np.ndarray]:
+        """Turns the mapping of action weights into probabilities.
+
+        Args:
+            action_weights (Mapping[str, float]): Weights of actions.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Codes of actions and their probabilities.
+        """
+        actions = list(action_weights.keys())
+        for action in actions:
+            self.__check_action(action)
+        weights = np.array([action_weights[action]
+                           for action in actions], dtype=float)
+        if len(actions) == 0 or (weights < 0).any() or weights.sum() <= 0:
+            raise ValueError(
+                "Action weights must be non-negative and have a positive sum.")
+
+        codes = np.array([CHAR_ACTIONS.index(action)
+                         for action in actions], dtype=np.int64)
+
+        return codes, weights / weights.sum()
+
+    def __sample_actions(self, action: Union[str, Mapping[str, float]], size: int) -> np.ndarray:
+        """Chooses an action for each augmented position.
+
+        Args:
+            action (Union[str, Mapping[str, float]]): The action or a mapping of action weights.
+            size (int): The amount of augmentation.
+
+        Returns:
+            np.ndarray: Code of the action (index in CHAR_ACTIONS) for each position.
+        """
+        if isinstance(action, abc.Mapping):
+            if action is self.action_weights:
+                codes, probas = self.__action_mix
+            else:
+                codes, probas = self.__normalize_weights(action)
+            return self._np_random.choice(codes, size=size, p=probas)
+
+        self.__check_action(action)
+
+        return np.full(size, CHAR_ACTIONS.index(action), dtype=np.int64)
+
     # def _clean_punc(self, text: str) -> str:
     #     """Clears the text from punctuation.
 
@@ -157,35 +282,144 @@ class CharAug(BaseAug):
     #     """
     #     return text.translate(str.maketrans("", "", string.punctuation))
 
-    def augment(self, text, action=None):
+    __char_actions = {
+        "shift": __shift,
+        "orfo": __orfo,
+        "typo": __typo,
+        "delete": __delete,
+        "insert": __insert,
+        "multiply": __multiply,
+    }
+
+    def __resolve_action(self, action: Union[None, str, Mapping[str, float]]) -> Union[str, Mapping[str, float]]:
+        """Replaces a missing action with `action_weights` or a random action.
+
+        Args:
+            action (Union[None, str, Mapping[str, float]]): The action or a mapping of action weights.
+
+        Returns:
+            Union[str, Mapping[str, float]]: The action or a mapping of action weights.
+        """
         if action is None:
-            action = np.random.choice(CHAR_ACTIONS)
-
-        typo_text_arr = list(text)
-        aug_idxs = self._aug_indexing(typo_text_arr, self.unit_prob, clip=True)
-        for idx in aug_idxs:
-            if action == "typo":
-                typo_text_arr[idx] = self.__typo(typo_text_arr[idx])
-            elif action == "shift":
-                typo_text_arr[idx] = self.__shift(typo_text_arr[idx])
-            elif action == "delete":
-                typo_text_arr[idx] = self.__delete()
-            elif action == "insert":
-                typo_text_arr[idx] = self.__insert(typo_text_arr[idx])
-            elif action == "orfo":
-                typo_text_arr[idx] = self.__orfo(typo_text_arr[idx])
-            elif action == "multiply":
-                typo_text_arr[idx] = self.__multiply(typo_text_arr[idx])
-            elif action == "swap":
-                sw = max(0, idx - 1)
-                typo_text_arr[sw], typo_text_arr[idx] = (
-                    typo_text_arr[idx],
-                    typo_text_arr[sw],
-                )
+            if self.action_weights is not None:
+                action = self.action_weights
             else:
-                raise NameError(
-                    """These type of augmentation is not available, please try TypoAug.actions_list() to see
-                available augmentations"""
-                )
+                action = self._np_random.choice(CHAR_ACTIONS)
+
+        return action
+
+    def __monitor_key(self, action: Union[str, Mapping[str, float]], aug_actions: np.ndarray) -> str:
+        """Names the actions of an augmented text for the monitor.
+
+        Args:
+            action (Union[str, Mapping[str, float]]): The action or a mapping of action weights.
+            aug_actions (np.ndarray): Codes of applied actions.
+
+        Returns:
+            str: The action, or the applied actions of a mix joined by '+', like 'typo+swap'.
+        """
+        if isinstance(action, str):
+            return action
+
+        return "+".join(CHAR_ACTIONS[code] for code in np.unique(aug_actions).tolist()) or "none"
+
+    def _plan_edits(self, text: str, action: Union[None, str, Mapping[str, float]] = None) -> Tuple[List[int], np.ndarray, np.ndarray]:
+        """Draws everything random that is needed to augment the text.
+
+        Args:
+            text (str): Text phrase.
+            action (Union[None, str, Mapping[str, float]], optional): The action or a mapping of action weights. Defaults to None.
+
+        Returns:
+            Tuple[List[int], np.ndarray, np.ndarray]: Indices of chars, codes of actions and uniform random numbers.
+        """
+        action = self.__resolve_action(action)
+        aug_idxs = self._aug_indexing(text, self.unit_prob, clip=True)
+        aug_actions = self.__sample_actions(action, len(aug_idxs))
+        draws = self._np_random.random(len(aug_idxs))
+
+        return aug_idxs, aug_actions, draws
+
+    def _apply_edits(self, text: str, aug_idxs: List[int], aug_actions: np.ndarray, draws: np.ndarray,
+                     edits: Union[Dict[str, list], None] = None) -> str:
+        """Applies planned edits with the selected backend.
+
+        The cost of the python backend grows with the number of edits, not the length of the text.
+        So the numba backend is used only with at least one edit per `SPARSE_EDIT_RATIO` chars.
+
+        Args:
+            text (str): Text phrase.
+            aug_idxs (List[int]): Indices of chars.
+            aug_actions (np.ndarray): Codes of actions.
+            draws (np.ndarray): Uniform random numbers.
+            edits (Dict[str, list], optional): If passed, the edits are appended to this log. They are then applied by the python backend, which gives the same text. Defaults to None.
+
+        Returns:
+            str: Modified text.
+        """
+        if self.__kernel is not None and edits is None and len(aug_idxs) * SPARSE_EDIT_RATIO >= len(text):
+            return self.__kernel.apply(text, aug_idxs, aug_actions, draws)
+
+        # Edited symbols are kept in an overlay, untouched slices of the text are copied as is.
+        overlay = {}
+        touched = {} if edits is not None else None
+        for idx, code, u in zip(aug_idxs, aug_actions.tolist(), draws.tolist()):
+            aug_action = CHAR_ACTIONS[code]
+            if aug_action == "swap":
+                self.__swap(text, overlay, idx)
+                if touched is not None:
+                    touched[max(0, idx - 1)] = aug_action
+            else:
+                overlay[idx] = self.__char_actions[aug_action](
+                    self, overlay.get(idx, text[idx]), u)
+            if touched is not None:
+                touched[idx] = aug_action
+
+        parts = []
+        start = 0
+        for idx in sorted(overlay):
+            parts.append(text[start:idx])
+            parts.append(overlay[idx])
+            start = idx + 1
+        parts.append(text[start:])
+        if edits is not None:
+            self._log_edits(edits, text, overlay, touched)
+
+        return "".join(parts)
+
+    def _augment(self, text: str, action: Union[None, str, Mapping[str, float]] = None,
+                 edits: Union[Dict[str, list], None] = None) -> str:
+        """Modifies the text according to the action and appends the edits to the log.
+
+        Args:
+            text (str): Text phrase.
+            action (Union[None, str, Mapping[str, float]], optional): The action or a mapping of action weights. Defaults to None.
+            edits (Dict[str, list], optional): If passed, the edits are appended to this log. Defaults to None.
+
+        Returns:
+            str: Modified text.
+        """
+        action = self.__resolve_action(action)
+        aug_idxs, aug_actions, draws = self._plan_edits(text, action)
+        aug_text = self._apply_edits(text, aug_idxs, aug_actions, draws, edits)
+        if self.monitor is not None:
+            # The key is built only if the text gets into the sample.
+            self.monitor.observe(text, aug_text, partial(
+                self.__monitor_key, action, aug_actions), self.lang)
+
+        return aug_text
+
+    def augment(self, text: str, action: Union[None, str, Mapping[str, float]] = None,
+                return_edits: bool = False) -> Union[str, Tuple[str, Dict[str, np.ndarray]]]:
+        """Modifies the text according to the action.
+
+        Args:
+            text (str): Text phrase.
+            action (Union[None, str, Mapping[str, float]], optional): The action to apply to the text or a mapping of action weights. If a mapping is passed, each position gets its own action. Defaults to None. If None, then `action_weights` or a random action is used.
+            return_edits (bool, optional): Also return the edit log: arrays "position" (index of the char in the text), "original" (the char), "replacement" (what it became, possibly empty or several chars) and "action" (the last action applied to the char). Only changed chars are listed, in order of position. A swap is listed as two changed chars. Defaults to False.
+
+        Returns:
+            Union[str, Tuple[str, Dict[str, np.ndarray]]]: Modified text and, if `return_edits`, the edit log.
+        """
 
-        return "".join(typo_text_arr)
+        return super().augment(text, action, return_edits)
@@ -0,0 +1,203 @@
+import sys
+import time
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+
+
+def _keep(probas: np.ndarray, top_k: Union[int, None], prob_mass: Union[float, None]) -> np.ndarray:
+    """Selects the candidates to keep.
+
+    Args:
+        probas (np.ndarray): Probabilities of candidates.
+        top_k (Union[int, None]): Maximum number of the most probable candidates to keep.
+        prob_mass (Union[float, None]): Probability mass that the most probable candidates must cover.
+
+    Returns:
+        np.ndarray: Sorted indices of kept candidates with non-zero probability.
+    """
+    order = np.argsort(-probas, kind="stable")
+    order = order[probas[order] > 0]
+    if prob_mass is not None:
+        covered = np.cumsum(probas[order]) / probas.sum()
+        order = order[:np.searchsorted(covered, prob_mass) + 1]
+    if top_k is not None:
+        order = order[:top_k]
+
+    return np.sort(order)
+
+
+def _check_params(top_k: Union[int, None], prob_mass: Union[float, None]) -> None:
+    if top_k is not None and top_k < 1:
+        raise ValueError(f"top_k must be positive. You put {top_k}.")
+    if prob_mass is not None and not 0 < prob_mass <= 1:
+        raise ValueError(f"prob_mass must be in (0, 1]. You put {prob_mass}.")
+
+
+def compact_char_statistic(
+    char_statistic: Dict[str, List[float]],
+    top_k: Union[int, None] = None,
+    prob_mass: Union[float, None] = None,
+) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """Turns dense char statistics over the vocab into sparse arrays.
+
+    Zero probabilities are always dropped, which does not change sampling. Pruning by
+    `top_k` or `prob_mass` drops rare candidates and renormalizes the rest.
+
+    Args:
+        char_statistic (Dict[str, List[float]]): Probabilities over the vocab for each char, like orfo_chars.json.
+        top_k (Union[int, None], optional): Maximum number of candidates per char. Defaults to None.
+        prob_mass (Union[float, None], optional): Probability mass that kept candidates must cover. Defaults to None.
+
+    Returns:
+        Dict[str, Tuple[np.ndarray, np.ndarray]]: Indices in the vocab and their probabilities for each char.
+    """
+    _check_params(top_k, prob_mass)
+    compacted = {}
+    for char, probas in char_statistic.items():
+        probas = np.asarray(probas, dtype=np.float64)
+        idxs = _keep(probas, top_k, prob_mass)
+        kept = probas[idxs]
+        if len(idxs) < np.count_nonzero(probas):
+            kept = kept / kept.sum()
+        compacted[char] = (idxs.astype(np.int32), kept)
+
+    return compacted
+
+
+def compact_word_statistic(
+    word_statistic: Dict[str, List[Union[List[str], List[float]]]],
+    top_k: Union[int, None] = None,
+    prob_mass: Union[float, None] = None,
+) -> Dict[str, Tuple[Tuple[str, ...], np.ndarray]]:
+    """Prunes rare candidates of word or ngram statistics.
+
+    Args:
+        word_statistic (Dict[str, List[Union[List[str], List[float]]]]): Candidates and their probabilities for each word, like orfo_words.json.
+        top_k (Union[int, None], optional): Maximum number of candidates per word. Defaults to None.
+        prob_mass (Union[float, None], optional): Probability mass that kept candidates must cover. Defaults to None.
+
+    Returns:
+        Dict[str, Tuple[Tuple[str, ...], np.ndarray]]: Kept candidates and their probabilities for each word.
+    """
+    _check_params(top_k, prob_mass)
+    compacted = {}
+    for word, (candidates, probas) in word_statistic.items():
+        probas = np.asarray(probas, dtype=np.float64)
+        idxs = _keep(probas, top_k, prob_mass)
+        kept = probas[idxs]
+        if len(idxs) < len(probas):
+            kept = kept / kept.sum()
+        compacted[word] = (tuple(candidates[i] for i in idxs), kept)
+
+    return compacted
+
+
+def _sizeof(data) -> int:
+    """Approximate memory taken by nested containers, strings and arrays."""
+    if isinstance(data, np.ndarray):
+        return sys.getsizeof(data) + (0 if data.flags.owndata else data.nbytes)
+    size = sys.getsizeof(data)
+    if isinstance(data, dict):
+        size += sum(_sizeof(k) + _sizeof(v) for k, v in data.items())
+    elif isinstance(data, (list, tuple)):
+        size += sum(_sizeof(v) for v in data)
+
+    return size
+
+
+def _dense(statistic: Dict) -> Dict[str, Dict[Union[int, str], float]]:
+    """Brings any supported statistics format to {key: {candidate: probability}}."""
+    dense = {}
+    for key, value in statistic.items():
+        if len(value) == 2 and not np.isscalar(value[0]):
+            candidates, probas = value
+            if isinstance(candidates, np.ndarray):
+                candidates = candidates.tolist()
+            dense[key] = {c: float(p) for c, p in zip(candidates, probas) if p > 0}
+        else:
+            dense[key] = {i: float(p) for i, p in enumerate(value) if p > 0}
+
+    return dense
+
+
+def _time_sampling(table: Dict, keys: List, rng: np.random.RandomState) -> Tuple[str, float]:
+    """Times sampling from the statistics the way the augmenters sample from this format.
+
+    Sparse char statistics are sampled by a binary search over precomputed cumulative
+    probabilities, like in CharAug. Dense char statistics (the original format) and word
+    statistics are sampled with np.random.choice, like in the original CharAug and in WordAug.
+
+    Args:
+        table (Dict): Statistics in any supported format.
+        keys (List): Keys to draw a sample for, in order.
+        rng (np.random.RandomState): Random state.
+
+    Returns:
+        Tuple[str, float]: Name of the sampler ('cdf' or 'choice') and time in seconds.
+    """
+    first = next(iter(table.values()), None)
+    if first is not None and len(first) == 2 and isinstance(first[0], np.ndarray):
+        cdfs = {}
+        for key, (_, probas) in table.items():
+            cdf = np.cumsum(probas)
+            cdfs[key] = cdf / cdf[-1]
+        draws = rng.random_sample(len(keys))
+        start = time.perf_counter()
+        for key, u in zip(keys, draws):
+            np.searchsorted(cdfs[key], u, side="right")
+
+        return "cdf", time.perf_counter() - start
+
+    start = time.perf_counter()
+    for key in keys:
+        value = table[key]
+        if len(value) == 2 and not np.isscalar(value[0]):
+            rng.choice(value[0], p=value[1])
+        else:
+            rng.choice(len(value), p=value)
+
+    return "choice", time.perf_counter() - start
+
+
+def compaction_report(statistic: Dict, compacted: Dict, n_draws: int = 10000,
+                      random_seed: int = 0) -> Dict[str, Union[str, float]]:
+    """Measures what the compaction saves and what it costs.
+
+    Args:
+        statistic (Dict): Original statistics.
+        compacted (Dict): Output of compact_char_statistic or compact_word_statistic for the same statistics.
+        n_draws (int, optional): Number of samples drawn to time sampling. Defaults to 10000.
+        random_seed (int, optional): Random seed for timing. Defaults to 0.
+
+    Returns:
+        Dict[str, Union[str, float]]: Memory in bytes, sampling time in seconds and the sampler timed on each side, numbers of candidates and total variation distance between original and compacted distributions.
+    """
+    before, after = _dense(statistic), _dense(compacted)
+    distances = []
+    for key, probas in before.items():
+        kept = after.get(key, {})
+        candidates = set(probas) | set(kept)
+        distances.append(0.5 * sum(abs(probas.get(c, 0.0) - kept.get(c, 0.0))
+                                   for c in candidates))
+
+    rng = np.random.RandomState(random_seed)
+    keys = list(statistic)
+    keys = [keys[i] for i in rng.randint(0, len(keys), size=n_draws)]
+    sampler_before, seconds_before = _time_sampling(statistic, keys, rng)
+    sampler_after, seconds_after = _time_sampling(compacted, keys, rng)
+
+    report = {
+        "bytes_before": _sizeof(statistic),
+        "bytes_after": _sizeof(compacted),
+        "sampler_before": sampler_before,
+        "sampler_after": sampler_after,
+        "sample_seconds_before": seconds_before,
+        "sample_seconds_after": seconds_after,
+        "candidates_before": sum(len(v) for v in before.values()),
+        "candidates_after": sum(len(v) for v in after.values()),
+        "max_tv_distance": float(max(distances, default=0.0)),
+        "mean_tv_distance": float(np.mean(distances)) if distances else 0.0,
+    }
+
+    return report
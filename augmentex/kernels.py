@@ -0,0 +1,261 @@
+import importlib.util
+import threading
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+from augmentex.variables import CHAR_ACTIONS, MULTIPLY_SKIP_CHARS
+
+# numba is imported only when the numba backend is selected, it is slow to import.
+NUMBA_AVAILABLE = importlib.util.find_spec("numba") is not None
+# With fewer edits than one per this many chars, the python backend is faster, because
+# the kernel converts the whole text to codepoints and back.
+SPARSE_EDIT_RATIO = 64
+
+SHIFT = CHAR_ACTIONS.index("shift")
+ORFO = CHAR_ACTIONS.index("orfo")
+TYPO = CHAR_ACTIONS.index("typo")
+DELETE = CHAR_ACTIONS.index("delete")
+MULTIPLY = CHAR_ACTIONS.index("multiply")
+SWAP = CHAR_ACTIONS.index("swap")
+INSERT = CHAR_ACTIONS.index("insert")
+
+
+def _copy(src, src_start, dst, dst_start, length):
+    """Copies `length` codepoints between buffers."""
+    for i in range(length):
+        dst[dst_start + i] = src[src_start + i]
+
+
+def _grow(buf, used, need):
+    """Returns a buffer with room for at least `need` codepoints."""
+    if need <= buf.shape[0]:
+        return buf
+    new_buf = np.empty(max(need, 2 * buf.shape[0]), np.int32)
+    _copy(buf, 0, new_buf, 0, used)
+
+    return new_buf
+
+
+def _search_right(cdf, u):
+    """Same as np.searchsorted(cdf, u, side='right')."""
+    lo = 0
+    hi = cdf.shape[0]
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if cdf[mid] <= u:
+            lo = mid + 1
+        else:
+            hi = mid
+
+    return lo
+
+
+def _apply_char_edits(
+    codepoints, aug_idxs, aug_actions, draws, shift_table, typo_starts, typo_lens,
+    typo_values, orfo_starts, orfo_lens, orfo_values, orfo_cdf, vocab, skip_table, mult_num
+):
+    """Applies char edits to an array of codepoints.
+
+    Every position owns a segment of the buffer, so the edits see the same state
+    as the list of strings in the pure Python path: substitutions only touch
+    single chars, swaps exchange whole segments and growing edits write a new
+    segment at the end of the buffer.
+    """
+    n = codepoints.shape[0]
+    buf = np.empty(n + 16, np.int32)
+    buf[:n] = codepoints
+    used = n
+    seg_start = np.arange(n)
+    seg_len = np.ones(n, np.int64)
+    table_size = shift_table.shape[0]
+
+    for j in range(aug_idxs.shape[0]):
+        idx = aug_idxs[j]
+        action = aug_actions[j]
+        u = draws[j]
+        start = seg_start[idx]
+        length = seg_len[idx]
+        if action == SWAP:
+            sw = max(0, idx - 1)
+            seg_start[idx] = seg_start[sw]
+            seg_len[idx] = seg_len[sw]
+            seg_start[sw] = start
+            seg_len[sw] = length
+        elif action == DELETE:
+            seg_len[idx] = 0
+        elif action == INSERT:
+            buf = _grow(buf, used, used + length + 1)
+            _copy(buf, start, buf, used, length)
+            buf[used + length] = vocab[int(u * vocab.shape[0])]
+            seg_start[idx] = used
+            seg_len[idx] = length + 1
+            used += length + 1
+        elif action == MULTIPLY:
+            if length == 1 and buf[start] < table_size and skip_table[buf[start]]:
+                continue
+            times = 1 + int(u * (mult_num - 1))
+            buf = _grow(buf, used, used + length * times)
+            for t in range(times):
+                _copy(buf, start, buf, used + t * length, length)
+            seg_start[idx] = used
+            seg_len[idx] = length * times
+            used += length * times
+        elif length == 1:
+            c = buf[start]
+            if c >= table_size:
+                continue
+            if action == SHIFT:
+                buf[start] = shift_table[c]
+            elif action == TYPO:
+                if typo_lens[c] > 0:
+                    buf[start] = typo_values[typo_starts[c] +
+                                             int(u * typo_lens[c])]
+            elif action == ORFO:
+                if orfo_lens[c] > 0:
+                    orfo_start = orfo_starts[c]
+                    buf[start] = orfo_values[orfo_start + _search_right(
+                        orfo_cdf[orfo_start:orfo_start + orfo_lens[c]], u)]
+
+    out = np.empty(seg_len.sum(), np.int32)
+    pos = 0
+    for i in range(n):
+        _copy(buf, seg_start[i], out, pos, seg_len[i])
+        pos += seg_len[i]
+
+    return out
+
+
+_kernel = None
+_kernel_lock = threading.Lock()
+
+
+def _load_kernel() -> Callable:
+    """Imports numba and compiles the kernels on first use.
+
+    Returns:
+        Callable: JIT-compiled `_apply_char_edits`.
+    """
+    global _kernel, _copy, _grow, _search_right
+    if _kernel is not None:
+        return _kernel
+
+    with _kernel_lock:
+        if _kernel is None:
+            try:
+                import numba
+            except ImportError as e:
+                raise ImportError(
+                    f"Numba backend requires `numba` to be installed. {e}") from e
+            # The kernel calls the helpers by their global names, so they are replaced in the module.
+            _copy = numba.njit(cache=True)(_copy)
+            _grow = numba.njit(cache=True)(_grow)
+            _search_right = numba.njit(cache=True)(_search_right)
+            _kernel = numba.njit(cache=True, nogil=True)(_apply_char_edits)
+
+    return _kernel
+
+
+class CharKernel():
+    """JIT-compiled char edits over codepoint arrays."""
+
+    def __init__(
+        self,
+        typo_dict: Dict[str, List[str]],
+        shift_dict: Dict[str, str],
+        orfo_cdf: Dict[str, Tuple[np.ndarray, np.ndarray]],
+        vocab: List[str],
+        mult_num: int,
+    ) -> None:
+        """
+        Args:
+            typo_dict (Dict[str, List[str]]): Adjacent keys for each char.
+            shift_dict (Dict[str, str]): Char with a different case for each char.
+            orfo_cdf (Dict[str, Tuple[np.ndarray, np.ndarray]]): Indices in the vocab and their cumulative probabilities for each char.
+            vocab (List[str]): Chars of the language.
+            mult_num (int): Maximum repetitions of characters.
+        """
+        if not NUMBA_AVAILABLE:
+            raise ImportError("Numba backend requires `numba` to be installed.")
+        _load_kernel()
+
+        chars = list(typo_dict.keys()) + list(shift_dict.keys()) + \
+            list(orfo_cdf.keys()) + list(MULTIPLY_SKIP_CHARS)
+        values = [v for vs in typo_dict.values() for v in vs] + \
+            list(shift_dict.values()) + list(vocab)
+        if any(len(char) != 1 for char in chars + values):
+            raise ValueError(
+                "Numba backend supports only single char statistics.")
+        table_size = max(ord(char) for char in chars + values) + 1
+
+        self.shift_table = np.arange(table_size, dtype=np.int32)
+        for char, shift_char in shift_dict.items():
+            self.shift_table[ord(char)] = ord(shift_char)
+
+        self.typo_starts = np.zeros(table_size, dtype=np.int64)
+        self.typo_lens = np.zeros(table_size, dtype=np.int64)
+        typo_values = []
+        for char, typo_chars in typo_dict.items():
+            self.typo_starts[ord(char)] = len(typo_values)
+            self.typo_lens[ord(char)] = len(typo_chars)
+            typo_values.extend(ord(typo_char) for typo_char in typo_chars)
+        self.typo_values = np.array(typo_values, dtype=np.int32)
+
+        self.vocab = np.array([ord(char) for char in vocab], dtype=np.int32)
+        self.orfo_starts = np.zeros(table_size, dtype=np.int64)
+        self.orfo_lens = np.zeros(table_size, dtype=np.int64)
+        orfo_values, orfo_cdf_values = [], []
+        for char, (idxs, cdf) in orfo_cdf.items():
+            self.orfo_starts[ord(char)] = sum(map(len, orfo_values))
+            self.orfo_lens[ord(char)] = len(idxs)
+            orfo_values.append(self.vocab[idxs])
+            orfo_cdf_values.append(cdf)
+        self.orfo_values = np.concatenate(
+            orfo_values + [np.zeros(0, dtype=np.int32)])
+        self.orfo_cdf = np.concatenate(orfo_cdf_values + [np.zeros(0)])
+
+        self.skip_table = np.zeros(table_size, dtype=np.bool_)
+        for char in MULTIPLY_SKIP_CHARS:
+            self.skip_table[ord(char)] = True
+        self.mult_num = mult_num
+
+        # numba compiles the kernel on the first call, so failures surface here and not in augment.
+        try:
+            self.apply("ab", [1], np.array([SWAP]), np.zeros(1))
+        except Exception as e:
+            raise RuntimeError(f"Numba backend failed to compile. {e}") from e
+
+    def apply(self, text: str, aug_idxs: List[int], aug_actions: np.ndarray, draws: np.ndarray) -> str:
+        """Applies planned edits to the text.
+
+        Args:
+            text (str): Original text.
+            aug_idxs (List[int]): Indices of edited chars.
+            aug_actions (np.ndarray): Code of the action (index in CHAR_ACTIONS) for each index.
+            draws (np.ndarray): Uniform random number for each index.
+
+        Returns:
+            str: Modified text.
+        """
+        # Lone surrogates are kept as codepoints, like in the python backend.
+        codepoints = np.frombuffer(
+            text.encode("utf-32-le", "surrogatepass"), dtype=np.int32)
+        out = _load_kernel()(
+            codepoints,
+            np.fromiter(aug_idxs, dtype=np.int64, count=len(aug_idxs)),
+            np.asarray(aug_actions, dtype=np.int64),
+            np.asarray(draws, dtype=np.float64),
+            self.shift_table,
+            self.typo_starts,
+            self.typo_lens,
+            self.typo_values,
+            self.orfo_starts,
+            self.orfo_lens,
+            self.orfo_values,
+            self.orfo_cdf,
+            self.vocab,
+            self.skip_table,
+            self.mult_num,
+        )
+
+        return out.tobytes().decode("utf-32-le", "surrogatepass")
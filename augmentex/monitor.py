@@ -0,0 +1,111 @@
+import random
+import threading
+from collections import defaultdict, deque
+from typing import Callable, Dict, List, Tuple, Union
+
+import numpy as np
+import Levenshtein as levenshtein
+
+
+class AugMonitor():
+    """Sampled monitor of the augmentation strength.
+
+    Measures the character (CER) and word (WER) error rates of augmented texts against
+    the original ones and keeps them in rolling windows per action and language.
+    Char and word actions share names, so use a separate monitor for each augmenter.
+    Texts augmented with a mix of actions are kept under the applied actions joined by '+'.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 0.01,
+        window_size: int = 10000,
+        bins: int = 20,
+        random_seed: Union[int, None] = None,
+    ) -> None:
+        """
+        Args:
+            sample_rate (float, optional): Fraction of augmented texts to measure. Defaults to 0.01.
+            window_size (int, optional): Number of the latest measurements kept per action and language. Defaults to 10000.
+            bins (int, optional): Number of histogram bins over [0, 1]. Rates above 1 fall into the last bin. Defaults to 20.
+            random_seed (int, optional): Random seed for sampling. Default to None.
+        """
+        if not 0 <= sample_rate <= 1:
+            raise ValueError(
+                f"Sample rate must be in [0, 1]. You put {sample_rate}.")
+
+        self.sample_rate = sample_rate
+        self.window_size = window_size
+        self.bins = bins
+        self.random_seed = random_seed
+
+        self.__random = random.Random(random_seed)
+        self.__lock = threading.Lock()
+        self.__cer = defaultdict(lambda: deque(maxlen=self.window_size))
+        self.__wer = defaultdict(lambda: deque(maxlen=self.window_size))
+
+    def __getstate__(self) -> Dict:
+        state = {
+            "sample_rate": self.sample_rate,
+            "window_size": self.window_size,
+            "bins": self.bins,
+            "random_seed": self.random_seed,
+        }
+
+        return state
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__init__(**state)
+
+    def observe(self, text: str, aug_text: str, action: Union[str, Callable[[], str]], lang: str) -> None:
+        """Measures the pair of texts if it gets into the sample.
+
+        Args:
+            text (str): Original text.
+            aug_text (str): Augmented text.
+            action (Union[str, Callable[[], str]]): Applied action, or a function that names it. The function is called only for sampled texts.
+            lang (str): Language of texts.
+        """
+        if self.__random.random() >= self.sample_rate:
+            return
+        if callable(action):
+            action = action()
+
+        words = text.split()
+        cer = levenshtein.distance(text, aug_text) / max(len(text), 1)
+        wer = levenshtein.distance(
+            words, aug_text.split()) / max(len(words), 1)
+        key = (str(action), lang)
+        with self.__lock:
+            self.__cer[key].append(cer)
+            self.__wer[key].append(wer)
+
+    def histograms(self) -> Dict[Tuple[str, str], Dict[str, Union[int, float, List[float], List[int]]]]:
+        """Builds histograms of the error rates in the current windows.
+
+        Returns:
+            Dict[Tuple[str, str], Dict[str, Union[int, float, List[float], List[int]]]]: Statistics for each (action, lang).
+        """
+        with self.__lock:
+            windows = {key: (list(self.__cer[key]), list(self.__wer[key]))
+                       for key in self.__cer}
+
+        bin_edges = np.linspace(0, 1, self.bins + 1)
+        histograms = {}
+        for key, (cer, wer) in windows.items():
+            histograms[key] = {
+                "count": len(cer),
+                "cer_mean": float(np.mean(cer)),
+                "wer_mean": float(np.mean(wer)),
+                "bin_edges": bin_edges.tolist(),
+                "cer_hist": np.histogram(np.clip(cer, 0, 1), bins=bin_edges)[0].tolist(),
+                "wer_hist": np.histogram(np.clip(wer, 0, 1), bins=bin_edges)[0].tolist(),
+            }
+
+        return histograms
+
+    def reset(self) -> None:
+        """Clears all windows."""
+        with self.__lock:
+            self.__cer.clear()
+            self.__wer.clear()
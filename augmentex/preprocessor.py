@@ -8,6 +8,32 @@ import Levenshtein as levenshtein
 
 from augmentex.variables import SUPPORT_LANGUAGES
 
+try:
+    from rapidfuzz.distance import Levenshtein as rapidfuzz_levenshtein
+    from rapidfuzz.process import cpdist
+except ImportError:
+    cpdist = None
+
+MAX_WORD_DISTANCE = 2
+
+
+def _distances(pairs: List[Tuple[str, str]], score_cutoff: int) -> List[int]:
+    """Computes Levenshtein distances of word pairs in one batch if rapidfuzz allows it.
+
+    Args:
+        pairs (List[Tuple[str, str]]): List with pairs of words.
+        score_cutoff (int): Distances above it are returned as score_cutoff + 1.
+
+    Returns:
+        List[int]: Distance of each pair.
+    """
+    if cpdist is not None:
+        return cpdist([pair[0] for pair in pairs], [pair[1] for pair in pairs],
+                      scorer=rapidfuzz_levenshtein.distance, score_cutoff=score_cutoff).tolist()
+
+    return [levenshtein.distance(true_word, broke_word, score_cutoff=score_cutoff)
+            for true_word, broke_word in pairs]
+
 
 class ComputeStatistic():
     """A class for counting spelling errors."""
@@ -99,42 +125,68 @@ class ComputeStatistic():
 
         return data
 
-    def __filter(self, correct_texts: List[str], error_texts: List[str]) -> List[Tuple[str, str]]:
+    def __count_pairs(self, correct_texts: List[str], error_texts: List[str]) -> Dict[Tuple[str, str], int]:
+        """Counts identical pairs of texts.
+
+        Args:
+            correct_texts (List[str]): List with correct texts.
+            error_texts (List[str]): List with error texts.
+
+        Returns:
+            Dict[Tuple[str, str], int]: Number of occurrences of each pair, in order of first occurrence.
+        """
+        count_pairs = defaultdict(int)
+        for pair in zip(correct_texts, error_texts):
+            count_pairs[pair] += 1
+
+        return count_pairs
+
+    def __filter(self, correct_texts: List[str], error_texts: List[str], counts: List[int]) -> Dict[Tuple[str, str], int]:
         """Matches the correct word with the word with an error.
 
+        Identical pairs of texts and of words are processed once. Words that differ in length by
+        more than the maximum distance are rejected without computing it.
+
         Args:
             correct_texts (List[str]): List with correct texts.
             error_texts (List[str]): List with error texts.
+            counts (List[int]): Number of occurrences of each pair of texts.
 
         Returns:
-            List[Tuple[str, str]]: List with pairs of words.
+            Dict[Tuple[str, str], int]: Number of occurrences of each pair of words, in order of first occurrence.
         """
-        pairs = []
-        for i in range(len(correct_texts)):
-            if correct_texts[i] != error_texts[i]:
-                correct_texts_i_split = correct_texts[i].split()
-                error_texts_i_split = error_texts[i].split()
-                if len(correct_texts_i_split) == len(error_texts_i_split):
-                    for word_idx in range(len(correct_texts_i_split)):
-                        true_word = correct_texts_i_split[word_idx]
-                        broke_word = error_texts_i_split[word_idx]
-                        if true_word != broke_word and levenshtein.distance(true_word, broke_word) <= 2:
-                            pairs.append((true_word, broke_word))
+        text_pairs = defaultdict(int)
+        for correct_text, error_text, count in zip(correct_texts, error_texts, counts):
+            if correct_text != error_text:
+                text_pairs[(correct_text, error_text)] += count
+
+        word_pairs = defaultdict(int)
+        for (correct_text, error_text), count in text_pairs.items():
+            correct_texts_i_split = correct_text.split()
+            error_texts_i_split = error_text.split()
+            if len(correct_texts_i_split) == len(error_texts_i_split):
+                for true_word, broke_word in zip(correct_texts_i_split, error_texts_i_split):
+                    if true_word != broke_word and abs(len(true_word) - len(broke_word)) <= MAX_WORD_DISTANCE:
+                        word_pairs[(true_word, broke_word)] += count
+
+        distances = _distances(list(word_pairs), MAX_WORD_DISTANCE)
+        pairs = {pair: count for (pair, count), distance in zip(word_pairs.items(), distances)
+                 if distance <= MAX_WORD_DISTANCE}
 
         return pairs
 
-    def __compute_word_statistic(self, pairs: List[Tuple[str, str]]) -> Dict[str, List[Union[List[str], List[float]]]]:
+    def __compute_word_statistic(self, pairs: Dict[Tuple[str, str], int]) -> Dict[str, List[Union[List[str], List[float]]]]:
         """From pairs of words , it compiles statistics on the use of words with errors.
 
         Args:
-            pairs (List[Tuple[str, str]]): List with pairs of words.
+            pairs (Dict[Tuple[str, str], int]): Number of occurrences of each pair of words.
 
         Returns:
             Dict[str, List[Union[List[str], List[float]]]]: Statistics for Augmentex.
         """
         count_pairs = defaultdict(int)
-        for pair in pairs:
-            count_pairs[f"{pair[0]}_{pair[1]}"] += 1
+        for pair, count in pairs.items():
+            count_pairs[f"{pair[0]}_{pair[1]}"] += count
 
         word_statistic = {}
         for pair in list(count_pairs.items()):
@@ -152,16 +204,17 @@ class ComputeStatistic():
 
         return word_statistic
 
-    def __compute_char_statistic(self, pairs: List[Tuple[str, str]]) -> Dict[str, List[float]]:
+    def __compute_char_statistic(self, pairs: Dict[Tuple[str, str], int]) -> Dict[str, List[float]]:
         """From pairs of words , statistics on the use of the wrong char are compiled.
 
         Args:
-            pairs (List[Tuple[str, str]]): List with pairs of words.
+            pairs (Dict[Tuple[str, str], int]): Number of occurrences of each pair of words.
 
         Returns:
             Dict[str, List[float]]: Statistics for Augmentex.
         """
-        unique_pairs = list(set(pairs))
+        # Adding pairs in order of first occurrence gives the same set order as adding all of them.
+        unique_pairs = list(set(list(pairs)))
         char_pairs = []
         for pair in unique_pairs:
             true_word = pair[0]
@@ -200,16 +253,17 @@ class ComputeStatistic():
 
         return char_statistic
 
-    def __compute_ngram_statistic(self, pairs: List[Tuple[str, str]], n: int = 3) -> Dict[str, List[Union[List[str], List[float]]]]:
+    def __compute_ngram_statistic(self, pairs: Dict[Tuple[str, str], int], n: int = 3) -> Dict[str, List[Union[List[str], List[float]]]]:
         """From pairs of words , it compiles statistics on the use of ngrams with errors.
 
         Args:
-            pairs (List[Tuple[str, str]]): List with pairs of words.
+            pairs (Dict[Tuple[str, str], int]): Number of occurrences of each pair of words.
 
         Returns:
             Dict[str, List[Union[List[str], List[float]]]]: Statistics for Augmentex.
         """
-        unique_pairs = list(set(pairs))
+        # Adding pairs in order of first occurrence gives the same set order as adding all of them.
+        unique_pairs = list(set(list(pairs)))
         ngram_pairs = []
         for pair in unique_pairs:
             true_word = pair[0]
@@ -252,10 +306,14 @@ class ComputeStatistic():
         Returns:
             Dict[str, List[Union[List[str], List[float]]]]: Statistics for Augmentex.
         """
-        preprocess_correct_texts = self.__preprocess(self.correct_texts)
-        preprocess_error_texts = self.__preprocess(self.error_texts)
+        text_pairs = self.__count_pairs(self.correct_texts, self.error_texts)
+        preprocess_correct_texts = self.__preprocess(
+            [pair[0] for pair in text_pairs])
+        preprocess_error_texts = self.__preprocess(
+            [pair[1] for pair in text_pairs])
 
-        pairs = self.__filter(preprocess_correct_texts, preprocess_error_texts)
+        pairs = self.__filter(preprocess_correct_texts,
+                              preprocess_error_texts, list(text_pairs.values()))
 
         char_statistic = self.__compute_char_statistic(pairs)
 
@@ -267,10 +325,14 @@ class ComputeStatistic():
         Returns:
             Dict[str, List[Union[List[str], List[float]]]]: Statistics for Augmentex.
         """
-        preprocess_correct_texts = self.__preprocess(self.correct_texts)
-        preprocess_error_texts = self.__preprocess(self.error_texts)
-
-        pairs = self.__filter(preprocess_correct_texts, preprocess_error_texts)
+        text_pairs = self.__count_pairs(self.correct_texts, self.error_texts)
+        preprocess_correct_texts = self.__preprocess(
+            [pair[0] for pair in text_pairs])
+        preprocess_error_texts = self.__preprocess(
+            [pair[1] for pair in text_pairs])
+
+        pairs = self.__filter(preprocess_correct_texts,
+                              preprocess_error_texts, list(text_pairs.values()))
 
         word_statistic = self.__compute_word_statistic(pairs)
         ngram_statistic = self.__compute_ngram_statistic(pairs)
@@ -0,0 +1,401 @@
+import inspect
+import json
+import errno
+import os
+import queue
+import socket
+import socketserver
+import stat
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+
+from augmentex.base import BaseAug
+from augmentex.char import CharAug
+from augmentex.word import WordAug
+
+AUG_LEVELS = {"char": CharAug, "word": WordAug}
+# Errors caused by the request. Others, like missing statistics, are errors of the server.
+CLIENT_ERRORS = (ValueError, NameError, KeyError, TypeError)
+
+
+class AugPool():
+    """Warm augmenters, one per level, language and platform."""
+
+    def __init__(self, **aug_kwargs) -> None:
+        """
+        Args:
+            aug_kwargs: Arguments passed to every CharAug/WordAug, e.g. unit_prob or random_seed.
+                Arguments of one level only (like backend for CharAug) are passed to that level only.
+        """
+        self.aug_kwargs = aug_kwargs
+        self.__augs = {}
+        self.__errors = {}
+        self.__lock = threading.Lock()
+
+    def get(self, level: str, lang: str, platform: str) -> BaseAug:
+        """Returns the augmenter, creating it on first use.
+
+        If the augmenter fails to load for a reason other than bad arguments (e.g. its statistics
+        are missing), the error is remembered and raised again without reloading.
+
+        Args:
+            level (str): 'char' or 'word'.
+            lang (str): Language of texts.
+            platform (str): Type of platform where statistic was collected.
+
+        Returns:
+            BaseAug: Augmenter.
+        """
+        if level not in AUG_LEVELS:
+            raise ValueError(
+                f"Augmentex support only {', '.join(AUG_LEVELS)} levels. You put {level}.")
+
+        key = (level, lang, platform)
+        with self.__lock:
+            if key in self.__errors:
+                raise self.__errors[key].with_traceback(None)
+            if key not in self.__augs:
+                aug_class = AUG_LEVELS[level]
+                params = inspect.signature(aug_class).parameters
+                kwargs = {k: v for k, v in self.aug_kwargs.items()
+                          if k in params}
+                try:
+                    self.__augs[key] = aug_class(
+                        lang=lang, platform=platform, **kwargs)
+                except CLIENT_ERRORS:
+                    raise
+                except Exception as e:
+                    self.__errors[key] = e
+                    raise
+
+            return self.__augs[key]
+
+
+class MicroBatcher():
+    """Merges concurrent requests into micro-batches and runs them through aug_batch."""
+
+    def __init__(self, pool: AugPool, max_batch_size: int = 256, max_latency: float = 0.005, window_size: int = 10000) -> None:
+        """
+        Args:
+            pool (AugPool): Warm augmenters.
+            max_batch_size (int, optional): Maximum number of texts in a micro-batch. Defaults to 256.
+            max_latency (float, optional): Maximum time in seconds to wait for more requests after the first one. Defaults to 0.005.
+            window_size (int, optional): Number of the latest requests used for latency percentiles. Defaults to 10000.
+        """
+        self.pool = pool
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+
+        self.__queue = queue.Queue()
+        self.__closed = False
+        self.__close_lock = threading.Lock()
+        self.__stats_lock = threading.Lock()
+        self.__started = time.monotonic()
+        self.__latencies = deque(maxlen=window_size)
+        self.__finished = deque(maxlen=window_size)
+        self.__counters = {"requests": 0, "texts": 0, "batches": 0, "errors": 0}
+
+        self.__worker = threading.Thread(target=self.__run, daemon=True)
+        self.__worker.start()
+
+    def submit(self, texts: List[str], level: str = "char", action: Union[None, str, Dict[str, float]] = None,
+               lang: str = "rus", platform: str = "pc") -> List[str]:
+        """Augments texts together with other pending requests and waits for the result.
+
+        Args:
+            texts (List[str]): Texts for augmentation.
+            level (str, optional): 'char' or 'word'. Defaults to 'char'.
+            action (Union[None, str, Dict[str, float]], optional): The action to apply. Defaults to None.
+            lang (str, optional): Language of texts. Default to 'rus'.
+            platform (str, optional): Type of platform where statistic was collected. Defaults to 'pc'.
+
+        Returns:
+            List[str]: Augmented texts.
+        """
+        group = (level, lang, platform, json.dumps(action, sort_keys=True))
+        future = Future()
+        with self.__close_lock:
+            if self.__closed:
+                raise RuntimeError("MicroBatcher is closed.")
+            self.__queue.put((group, action, texts, time.monotonic(), future))
+
+        return future.result()
+
+    def close(self) -> None:
+        """Stops the worker after pending requests. Later submissions raise RuntimeError."""
+        with self.__close_lock:
+            if not self.__closed:
+                self.__closed = True
+                self.__queue.put(None)
+        self.__worker.join()
+
+    def __collect(self) -> Union[List[Tuple], None]:
+        """Waits for a request and collects others that come within max_latency.
+
+        Returns:
+            Union[List[Tuple], None]: Requests of the micro-batch or None if the batcher is closed.
+        """
+        item = self.__queue.get()
+        if item is None:
+            return None
+        items = [item]
+        size = len(item[2])
+        deadline = time.monotonic() + self.max_latency
+        while size < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = self.__queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is None:
+                self.__queue.put(None)
+                break
+            items.append(item)
+            size += len(item[2])
+
+        return items
+
+    def __run(self) -> None:
+        while True:
+            items = self.__collect()
+            if items is None:
+                return
+
+            groups = {}
+            for item in items:
+                groups.setdefault(item[0], []).append(item)
+            for (level, lang, platform, _), group_items in groups.items():
+                self.__run_group(level, lang, platform, group_items)
+
+    def __run_group(self, level: str, lang: str, platform: str, items: List[Tuple]) -> None:
+        """Augments the requests of one augmenter and action in one aug_batch call.
+
+        Args:
+            level (str): 'char' or 'word'.
+            lang (str): Language of texts.
+            platform (str): Type of platform where statistic was collected.
+            items (List[Tuple]): Requests.
+        """
+        action = items[0][1]
+        texts = [text for item in items for text in item[2]]
+        try:
+            aug = self.pool.get(level, lang, platform)
+            if len(texts) == 1:
+                aug_texts = [aug.augment(texts[0], action)]
+            else:
+                aug_texts = aug.aug_batch(texts, batch_prob=1.0, action=action)
+        except Exception as e:
+            if len(items) > 1:
+                # Do not fail the whole micro-batch because of one bad request.
+                for item in items:
+                    self.__run_group(level, lang, platform, [item])
+                return
+            items[0][4].set_exception(e)
+            with self.__stats_lock:
+                self.__counters["errors"] += 1
+            return
+
+        now = time.monotonic()
+        start = 0
+        with self.__stats_lock:
+            for _, _, item_texts, submitted, future in items:
+                future.set_result(aug_texts[start:start + len(item_texts)])
+                start += len(item_texts)
+                self.__latencies.append(now - submitted)
+            self.__finished.append((now, len(texts)))
+            self.__counters["requests"] += len(items)
+            self.__counters["texts"] += len(texts)
+            self.__counters["batches"] += 1
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Returns:
+            Dict[str, float]: Counters, throughput in texts per second and latency percentiles in milliseconds.
+        """
+        now = time.monotonic()
+        with self.__stats_lock:
+            stats = dict(self.__counters)
+            latencies = np.array(self.__latencies) * 1000
+            finished = list(self.__finished)
+
+        stats["uptime"] = now - self.__started
+        stats["mean_batch_size"] = stats["texts"] / max(stats["batches"], 1)
+        stats["texts_per_second"] = stats["texts"] / max(stats["uptime"], 1e-9)
+        recent = [n for t, n in finished if now - t <= 10]
+        stats["recent_texts_per_second"] = sum(
+            recent) / max(min(10, stats["uptime"]), 1e-9)
+        for q in [50, 90, 99]:
+            stats[f"latency_p{q}_ms"] = float(
+                np.percentile(latencies, q)) if len(latencies) else 0.0
+        stats["latency_max_ms"] = float(
+            latencies.max()) if len(latencies) else 0.0
+
+        return stats
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """HTTP API of the server.
+
+    POST /augment {"texts": [...], "level": "char", "action": null, "lang": "rus", "platform": "pc"}
+    GET /stats
+    GET /health
+    """
+
+    def address_string(self) -> str:
+        # Unix sockets have no client address.
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format: str, *args) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def __send(self, code: int, data: Dict) -> None:
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        if self.path == "/stats":
+            self.__send(200, self.server.batcher.stats())
+        elif self.path == "/health":
+            self.__send(200, {"status": "ok"})
+        else:
+            self.__send(404, {"error": f"Unknown path {self.path}"})
+
+    def do_POST(self) -> None:
+        if self.path != "/augment":
+            self.__send(404, {"error": f"Unknown path {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length).decode("utf-8"))
+            texts = request["texts"] if "texts" in request else [
+                request["text"]]
+            if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+                raise TypeError("Texts must be a list of strings.")
+            aug_texts = self.server.batcher.submit(
+                texts,
+                level=request.get("level", "char"),
+                action=request.get("action"),
+                lang=request.get("lang", "rus"),
+                platform=request.get("platform", "pc"),
+            )
+        except CLIENT_ERRORS + (json.JSONDecodeError,) as e:
+            self.__send(400, {"error": str(e)})
+            return
+        except Exception as e:
+            self.__send(500, {"error": str(e)})
+            return
+
+        self.__send(200, {"texts": aug_texts})
+
+
+class _TCPHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+    def server_bind(self) -> None:
+        self.__bound = False
+        path = self.server_address
+        if os.path.exists(path) and stat.S_ISSOCK(os.stat(path).st_mode):
+            # Remove the socket of a dead server, but never take over a live one.
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                try:
+                    probe.connect(path)
+                except (ConnectionRefusedError, FileNotFoundError):
+                    os.remove(path)
+                else:
+                    raise OSError(errno.EADDRINUSE,
+                                  f"Socket {path} is in use by a running server.")
+        super().server_bind()
+        self.__bound = True
+
+    def server_close(self) -> None:
+        super().server_close()
+        # The socket file is removed only if this server created it.
+        if self.__bound and os.path.exists(self.server_address):
+            os.remove(self.server_address)
+
+
+def make_server(
+    batcher: MicroBatcher,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    unix_socket: Union[str, None] = None,
+    verbose: bool = False,
+) -> socketserver.BaseServer:
+    """Creates the HTTP server over TCP or a Unix socket.
+
+    Args:
+        batcher (MicroBatcher): Batcher that runs the augmentation.
+        host (str, optional): Host to listen on. Defaults to '127.0.0.1'.
+        port (int, optional): Port to listen on. Defaults to 8000.
+        unix_socket (Union[str, None], optional): Path of a Unix socket to listen on instead of TCP. Defaults to None.
+        verbose (bool, optional): Log every request. Defaults to False.
+
+    Returns:
+        socketserver.BaseServer: Server, call serve_forever() to run it.
+    """
+    if unix_socket is not None:
+        server = _UnixHTTPServer(unix_socket, _Handler)
+    else:
+        server = _TCPHTTPServer((host, port), _Handler)
+    server.batcher = batcher
+    server.verbose = verbose
+
+    return server
+
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    unix_socket: Union[str, None] = None,
+    max_batch_size: int = 256,
+    max_latency: float = 0.005,
+    preload: Union[List[str], None] = None,
+    verbose: bool = False,
+    **aug_kwargs,
+) -> None:
+    """Runs the augmentation server until interrupted.
+
+    Args:
+        host (str, optional): Host to listen on. Defaults to '127.0.0.1'.
+        port (int, optional): Port to listen on. Defaults to 8000.
+        unix_socket (Union[str, None], optional): Path of a Unix socket to listen on instead of TCP. Defaults to None.
+        max_batch_size (int, optional): Maximum number of texts in a micro-batch. Defaults to 256.
+        max_latency (float, optional): Maximum time in seconds to wait for more requests after the first one. Defaults to 0.005.
+        preload (Union[List[str], None], optional): Augmenters to create at start as 'level:lang:platform'. Defaults to None.
+        verbose (bool, optional): Log every request. Defaults to False.
+        aug_kwargs: Arguments passed to every CharAug/WordAug.
+    """
+    pool = AugPool(**aug_kwargs)
+    for spec in preload or []:
+        level, lang, platform = spec.split(":")
+        pool.get(level, lang, platform)
+    batcher = MicroBatcher(pool, max_batch_size=max_batch_size,
+                           max_latency=max_latency)
+    server = make_server(batcher, host=host, port=port,
+                         unix_socket=unix_socket, verbose=verbose)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        batcher.close()
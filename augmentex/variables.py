@@ -4,3 +4,5 @@ WORD_ACTIONS = ["replace", "delete", "swap", "stopword",
                 "reverse", "text2emoji", "split", "ngram"]
 CHAR_ACTIONS = ["shift", "orfo", "typo",
                 "delete", "multiply", "swap", "insert"]
+MULTIPLY_SKIP_CHARS = [" ", ",", ".", "?", "!", "-"]
+CHAR_BACKENDS = ["python", "numba"]
@@ -1,10 +1,14 @@
 import os
 import re
-from typing import List, Union
+from itertools import chain
+from typing import Dict, List, Tuple, Union
 
 import numpy as np
 
+from augmentex.arrays import Batch, replace_rows, take_rows
 from augmentex.base import BaseAug
+from augmentex.compaction import compact_word_statistic
+from augmentex.monitor import AugMonitor
 from augmentex.preprocessor import ComputeStatistic
 from augmentex.variables import WORD_ACTIONS
 
@@ -22,6 +26,9 @@ class WordAug(BaseAug):
         platform: str = "pc",
         correct_texts_path: Union[str, None] = None,
         error_texts_path: Union[str, None] = None,
+        monitor: Union[AugMonitor, None] = None,
+        top_k: Union[int, None] = None,
+        prob_mass: Union[float, None] = None,
     ) -> None:
         """
         Args:
@@ -33,25 +40,33 @@ class WordAug(BaseAug):
             platform (str, optional): Type of platform where statistic was collected. Defaults to 'pc'.
             correct_texts_path (str, optional): Path to txt file with correct texts. Defaults to None.
             error_texts_path (str, optional): Path to txt file with error texts. Default to None.
+            monitor (AugMonitor, optional): Monitor of the augmentation strength. Defaults to None.
+            top_k (int, optional): Keep only the top-k most probable replacements of each word and ngram. Defaults to None.
+            prob_mass (float, optional): Keep only the most probable replacements of each word and ngram that cover this probability mass. Defaults to None.
         """
         super().__init__(min_aug=min_aug, max_aug=max_aug,
-                         random_seed=random_seed, lang=lang, platform=platform)
+                         random_seed=random_seed, lang=lang, platform=platform, monitor=monitor)
         dir_path = os.path.dirname(os.path.abspath(__file__))
 
-        self.stopwords = self._read_json(os.path.join(
-            dir_path, "static_data", self.lang, "stopwords.json"))
-        self.text2emoji_map = self._read_json(os.path.join(
-            dir_path, "static_data", self.lang, "text2emoji.json"))
+        self.stopwords = self._freeze(self._read_json(os.path.join(
+            dir_path, "static_data", self.lang, "stopwords.json")))
+        self.text2emoji_map = self._freeze(self._read_json(os.path.join(
+            dir_path, "static_data", self.lang, "text2emoji.json")))
 
         if correct_texts_path is not None or error_texts_path is not None:
             cs = ComputeStatistic(correct_texts_path,
                                   error_texts_path, self.lang)
-            self.orfo_dict, self.ngram_dict = cs.compute_word_statistic()
+            orfo_dict, ngram_dict = cs.compute_word_statistic()
         else:
-            self.orfo_dict = self._read_json(os.path.join(
+            orfo_dict = self._read_json(os.path.join(
                 dir_path, "static_data", self.lang, self.platform, "orfo_words.json"))
-            self.ngram_dict = self._read_json(os.path.join(
+            ngram_dict = self._read_json(os.path.join(
                 dir_path, "static_data", self.lang, self.platform, "orfo_ngrams.json"))
+        if top_k is not None or prob_mass is not None:
+            orfo_dict = compact_word_statistic(orfo_dict, top_k, prob_mass)
+            ngram_dict = compact_word_statistic(ngram_dict, top_k, prob_mass)
+        self.orfo_dict = self._freeze(orfo_dict)
+        self.ngram_dict = self._freeze(ngram_dict)
 
         self.unit_prob = unit_prob
 
@@ -67,10 +82,10 @@ class WordAug(BaseAug):
     def __ngram(self, word: str, n: int = 3) -> str:
         if len(word) > 3:
             word_ngrams = [word[i:i+n] for i in range(len(word)-n+1)]
-            random_ngram = np.random.choice(word_ngrams)
+            random_ngram = self._np_random.choice(word_ngrams)
             ngram_probas = self.ngram_dict.get(
                 random_ngram.lower(), [[random_ngram], [1.0]])
-            ngram_for_replace = np.random.choice(
+            ngram_for_replace = self._np_random.choice(
                 ngram_probas[0], p=ngram_probas[1])
             word = word.replace(random_ngram, ngram_for_replace)
 
@@ -93,18 +108,22 @@ class WordAug(BaseAug):
 
         return word
 
-    def __text2emoji(self, word: str) -> str:
+    def __text2emoji(self, word: str, u: Union[float, None] = None) -> str:
         """Replace word to emoji.
 
         Args:
             word (str): A word with the correct spelling.
+            u (float, optional): Pre-drawn uniform random number in [0, 1). Defaults to None. If None, it is drawn on the fly.
 
         Returns:
             str: Emoji that matches this word.
         """
         word = re.findall("[а-яА-ЯёЁa-zA-Z0-9']+|[.,!?;-]+", word)
         words = self.text2emoji_map.get(word[0].lower(), [word[0]])
-        word[0] = np.random.choice(words)
+        if u is None:
+            word[0] = self._np_random.choice(words)
+        else:
+            word[0] = words[int(u * len(words))]
 
         return "".join(word)
 
@@ -132,7 +151,7 @@ class WordAug(BaseAug):
         """
         word = re.findall("[а-яА-ЯёЁa-zA-Z0-9']+|[.,!?;]+", word)
         word_probas = self.orfo_dict.get(word[0].lower(), [[word[0]], [1.0]])
-        word[0] = np.random.choice(word_probas[0], p=word_probas[1])
+        word[0] = self._np_random.choice(word_probas[0], p=word_probas[1])
 
         return "".join(word)
 
@@ -145,59 +164,212 @@ class WordAug(BaseAug):
 
         return ""
 
-    def __stopword(self, word: str) -> str:
+    def __stopword(self, word: str, u: Union[float, None] = None) -> str:
         """Adds a stop word before the word.
 
         Args:
             word (str): Just word.
+            u (float, optional): Pre-drawn uniform random number in [0, 1). Defaults to None. If None, it is drawn on the fly.
 
         Returns:
             str: Stopword + word.
         """
-        stopword = np.random.choice(self.stopwords)
+        if u is None:
+            stopword = self._np_random.choice(self.stopwords)
+        else:
+            stopword = self.stopwords[int(u * len(self.stopwords))]
 
         return " ".join([stopword, word])
 
-    def augment(self, text: str, action: str = None) -> str:
-        """Modifies the phrase according to the action.
+    def __edit(self, tokens: List[str], idx: int, action: str, start: int, end: int, u: Union[float, None] = None,
+               touched: Union[Dict[int, str], None] = None) -> None:
+        """Applies the action to one word in place.
+
+        Args:
+            tokens (List[str]): Words of one or several phrases.
+            idx (int): Index of the word.
+            action (str): The action to apply.
+            start (int): Index of the first word of the phrase.
+            end (int): Index after the last word of the phrase.
+            u (float, optional): Pre-drawn uniform random number in [0, 1) for swap, stopword and text2emoji. Defaults to None. If None, it is drawn on the fly.
+            touched (Dict[int, str], optional): If passed, indices of changed words are recorded in it with the action. Defaults to None.
+        """
+        if action == "delete":
+            tokens[idx] = self.__delete()
+        elif action == "reverse":
+            tokens[idx] = self.__reverse_case(tokens[idx])
+        elif action == "swap":
+            # A phrase of one word has nothing to swap with.
+            if end - start < 2:
+                swap_idx = idx
+            elif u is None:
+                swap_idx = start + \
+                    self._np_random.randint(0, end - start - 1)
+            else:
+                swap_idx = start + int(u * (end - start - 1))
+            tokens[swap_idx], tokens[idx] = (
+                tokens[idx],
+                tokens[swap_idx],
+            )
+            if touched is not None:
+                touched[swap_idx] = action
+        elif action == "stopword":
+            tokens[idx] = self.__stopword(tokens[idx], u)
+        elif action == "ngram":
+            tokens[idx] = self.__ngram(tokens[idx])
+        elif action == "replace":
+            tokens[idx] = self.__replace(tokens[idx])
+        elif action == "text2emoji":
+            tokens[idx] = self.__text2emoji(tokens[idx], u)
+        elif action == "split":
+            tokens[idx] = self.__split(tokens[idx])
+        else:
+            raise NameError(
+                """These type of augmentation is not available, please check EDAAug.actions_list() to see
+                available augmentations"""
+            )
+        if touched is not None:
+            touched[idx] = action
+
+    def _augment(self, text: str, action: str = None, edits: Union[Dict[str, list], None] = None) -> str:
+        """Modifies the phrase according to the action and appends the edits to the log.
 
         Args:
             text (str): Text phrase.
             action (str, optional): The action to apply to the phrase.
+            edits (Dict[str, list], optional): If passed, the edits are appended to this log. Defaults to None.
 
         Returns:
             str: Modified phrase.
         """
         if action is None:
-            action = np.random.choice(WORD_ACTIONS)
+            action = self._np_random.choice(WORD_ACTIONS).tolist()
 
         aug_sent_arr = text.split()
+        words = aug_sent_arr.copy() if edits is not None else None
+        touched = {} if edits is not None else None
         aug_idxs = self._aug_indexing(aug_sent_arr, self.unit_prob, clip=True)
         for idx in aug_idxs:
-            if action == "delete":
-                aug_sent_arr[idx] = self.__delete()
-            elif action == "reverse":
-                aug_sent_arr[idx] = self.__reverse_case(aug_sent_arr[idx])
-            elif action == "swap":
-                swap_idx = np.random.randint(0, len(aug_sent_arr) - 1)
-                aug_sent_arr[swap_idx], aug_sent_arr[idx] = (
-                    aug_sent_arr[idx],
-                    aug_sent_arr[swap_idx],
-                )
-            elif action == "stopword":
-                aug_sent_arr[idx] = self.__stopword(aug_sent_arr[idx])
-            elif action == "ngram":
-                aug_sent_arr[idx] = self.__ngram(aug_sent_arr[idx])
-            elif action == "replace":
-                aug_sent_arr[idx] = self.__replace(aug_sent_arr[idx])
-            elif action == "text2emoji":
-                aug_sent_arr[idx] = self.__text2emoji(aug_sent_arr[idx])
-            elif action == "split":
-                aug_sent_arr[idx] = self.__split(aug_sent_arr[idx])
-            else:
-                raise NameError(
-                    """These type of augmentation is not available, please check EDAAug.actions_list() to see
-                available augmentations"""
-                )
+            self.__edit(aug_sent_arr, idx, action, 0,
+                        len(aug_sent_arr), touched=touched)
+
+        aug_text = re.sub(" +", " ", " ".join(aug_sent_arr).strip())
+        if self.monitor is not None:
+            self.monitor.observe(text, aug_text, action, self.lang)
+        if edits is not None:
+            self._log_edits(edits, words, aug_sent_arr, touched)
+
+        return aug_text
+
+    def augment(self, text: str, action: str = None, return_edits: bool = False) -> Union[str, Tuple[str, Dict[str, np.ndarray]]]:
+        """Modifies the phrase according to the action.
+
+        Args:
+            text (str): Text phrase.
+            action (str, optional): The action to apply to the phrase.
+            return_edits (bool, optional): Also return the edit log: arrays "position" (index of the word in `text.split()`), "original" (the word), "replacement" (what it became, possibly empty or several words) and "action". Only changed words are listed, in order of position. A swap is listed as two changed words. Defaults to False.
+
+        Returns:
+            Union[str, Tuple[str, Dict[str, np.ndarray]]]: Modified phrase and, if `return_edits`, the edit log.
+        """
+
+        return super().augment(text, action, return_edits)
 
-        return re.sub(" +", " ", " ".join(aug_sent_arr).strip())
+    def __sample_positions(self, sizes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Randomly selects words for augmentation in all phrases at once.
+
+        Args:
+            sizes (np.ndarray): Number of words in each phrase.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Flat indices of selected words, grouped by phrase in random order, and their phrases.
+        """
+        counts = np.where(
+            sizes > 1, (self.unit_prob * sizes).astype(np.int64), 0)
+        counts = np.clip(counts, self.min_aug, self.max_aug)
+        counts = np.minimum(counts, sizes)
+
+        token_lines = np.repeat(np.arange(len(sizes)), sizes)
+        starts = np.cumsum(sizes) - sizes
+        # Phrase index plus a random fraction sorts words by phrase and shuffles them inside it.
+        order = np.argsort(
+            token_lines + self._np_random.random(len(token_lines)))
+        order_lines = token_lines[order]
+        selected = np.arange(len(order)) - \
+            starts[order_lines] < counts[order_lines]
+
+        return order[selected], order_lines[selected]
+
+    def aug_batch(
+        self,
+        batch: Batch,
+        batch_prob: float = 1.0,
+        action: Union[None, str] = None,
+        num_threads: int = 1,
+        return_edits: bool = False,
+    ) -> Union[Batch, Tuple[Batch, Dict[str, np.ndarray]]]:
+        """The use of augmentation to several lines.
+
+        All lines are split once into a flat list of words. Words to edit and the random targets
+        of swap, stopword and text2emoji are drawn for the whole batch at once.
+
+        Args:
+            batch (Batch): List of lines for augmentation, a 1-d NumPy array of strings or an Arrow array of strings. Only selected lines are converted to Python strings.
+            batch_prob (float, optional): The percentage of units to which augmentation will be applied. Defaults to 1.0.
+            action (Union[None, str], optional): Indicates what action will be applied. Defaults to None. If None, then a random action is chosen for each line.
+            num_threads (int, optional): Number of threads to augment lines in. If more than 1, lines are augmented one by one in a thread pool. Defaults to 1.
+            return_edits (bool, optional): Also return the edit log of the batch, see `augment`. It has an extra "line" array with the index of the line of each edit and is sorted by line. Defaults to False.
+
+        Returns:
+            Union[Batch, Tuple[Batch, Dict[str, np.ndarray]]]: Augmented lines of the same type as `batch` and, if `return_edits`, the edit log. Missing lines (None or null) are kept as is.
+        """
+        if num_threads > 1:
+            return super().aug_batch(batch, batch_prob, action, num_threads, return_edits)
+
+        line_idxs = self._aug_indexing(batch, batch_prob)
+        line_idxs, lines = take_rows(batch, line_idxs)
+        if len(line_idxs) == 0:
+            if return_edits:
+                return replace_rows(batch, [], []), self._edit_arrays(self._new_edit_log(lines=True))
+            return replace_rows(batch, [], [])
+        if action is None:
+            line_actions = self._np_random.choice(
+                WORD_ACTIONS, size=len(line_idxs)).tolist()
+        else:
+            line_actions = [action] * len(line_idxs)
+
+        split_lines = [line.split() for line in lines]
+        sizes = np.fromiter(map(len, split_lines),
+                            dtype=np.int64, count=len(split_lines))
+        offsets = np.concatenate([[0], np.cumsum(sizes)]).tolist()
+        tokens = list(chain.from_iterable(split_lines))
+        words = tokens.copy() if return_edits else None
+        touched = {} if return_edits else None
+
+        aug_tokens, aug_lines = self.__sample_positions(sizes)
+        draws = self._np_random.random(len(aug_tokens))
+        for idx, line, u in zip(aug_tokens.tolist(), aug_lines.tolist(), draws.tolist()):
+            self.__edit(tokens, idx, line_actions[line],
+                        offsets[line], offsets[line + 1], u, touched)
+
+        spaces = re.compile(" +")
+        aug_texts = []
+        for line, text in enumerate(lines):
+            aug_text = spaces.sub(" ", " ".join(
+                tokens[offsets[line]:offsets[line + 1]]).strip())
+            if self.monitor is not None:
+                self.monitor.observe(text, aug_text, line_actions[line], self.lang)
+            aug_texts.append(aug_text)
+        aug_batch = replace_rows(batch, line_idxs, aug_texts)
+
+        if return_edits:
+            edits = self._new_edit_log(lines=True)
+            self._log_edits(edits, words, tokens, touched)
+            positions = np.array(edits["position"], dtype=np.int64)
+            lines = np.searchsorted(offsets, positions, side="right") - 1
+            edits["position"] = positions - \
+                np.asarray(offsets, dtype=np.int64)[lines]
+            edits["line"] = np.asarray(line_idxs, dtype=np.int64)[lines]
+            return aug_batch, self._edit_arrays(edits)
+
+        return aug_batch
@@ -0,0 +1,36 @@
+"""Compares aug_batch on an Arrow string column with a round trip through a Python list.
+
+Requires pyarrow.
+
+Usage:
+    python benchmarks/arrow_batch.py
+"""
+import time
+
+import pyarrow as pa
+
+from augmentex import CharAug
+
+TEXT = "Screw you guys, I am going home. (c) " * 10
+
+
+def main(size: int = 200000, repeats: int = 3):
+    column = pa.chunked_array([pa.array([TEXT] * (size // 8))] * 8)
+    for batch_prob in [0.0, 0.01, 0.1, 1.0]:
+        aug = CharAug(lang="eng", random_seed=42)
+        via_list, direct = float("inf"), float("inf")
+        for _ in range(repeats):
+            start = time.perf_counter()
+            pa.chunked_array([pa.array(aug.aug_batch(
+                column.to_pylist(), batch_prob=batch_prob))])
+            via_list = min(via_list, time.perf_counter() - start)
+
+            start = time.perf_counter()
+            aug.aug_batch(column, batch_prob=batch_prob)
+            direct = min(direct, time.perf_counter() - start)
+        print(
+            f"batch_prob={batch_prob}: via list {via_list * 1000:.0f} ms, arrow {direct * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
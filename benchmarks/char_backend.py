@@ -0,0 +1,50 @@
+"""Compares the python and numba backends of CharAug.
+
+`apply` is the time spent on the edits themselves (the part the backend replaces),
+`total` also includes planning: sampling of indices, actions and random numbers.
+
+Usage:
+    python benchmarks/char_backend.py
+"""
+import time
+
+from augmentex import CharAug
+
+TEXT = "Screw you guys, I am going home. (c) "
+
+
+def run(aug: CharAug, texts, action, seed: int = 42):
+    aug._seed_thread(seed)
+    start = time.perf_counter()
+    plans = [aug._plan_edits(text, action) for text in texts]
+    apply_start = time.perf_counter()
+    outputs = [aug._apply_edits(text, *plan)
+               for text, plan in zip(texts, plans)]
+    end = time.perf_counter()
+
+    return outputs, end - start, end - apply_start
+
+
+def main():
+    for length, max_aug in [(1, 5), (30, 5), (30, 10 ** 6), (3000, 10 ** 6)]:
+        texts = [TEXT * length] * max(10, 3000 // length)
+        python_aug = CharAug(unit_prob=0.3, max_aug=max_aug, lang="eng")
+        numba_aug = CharAug(unit_prob=0.3, max_aug=max_aug,
+                            lang="eng", backend="numba")
+        mix = {action: 1 for action in python_aug.actions_list}
+        for action in [mix, "typo", "insert"]:
+            run(numba_aug, texts[:1], action)
+            python_out, python_total, python_apply = run(
+                python_aug, texts, action)
+            numba_out, numba_total, numba_apply = run(
+                numba_aug, texts, action)
+            assert python_out == numba_out
+            name = action if isinstance(action, str) else "mix"
+            print(
+                f"chars={len(texts[0]):>7} max_aug={max_aug:>7} action={name:>6} | "
+                f"apply: python={python_apply:.3f}s numba={numba_apply:.3f}s x{python_apply / numba_apply:.1f} | "
+                f"total: python={python_total:.3f}s numba={numba_total:.3f}s x{python_total / numba_total:.1f}")
+
+
+if __name__ == "__main__":
+    main()
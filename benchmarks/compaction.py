@@ -0,0 +1,49 @@
+"""Reports memory, sampling time and distribution error of compacted statistics.
+
+Runs on the bundled orfo_chars.json and, if parallel corpora are passed, on word and ngram
+statistics computed from them.
+
+Usage:
+    python benchmarks/compaction.py [correct_texts.txt error_texts.txt]
+"""
+import json
+import os
+import sys
+
+from augmentex.compaction import compact_char_statistic, compact_word_statistic, compaction_report
+from augmentex.preprocessor import ComputeStatistic
+
+SETTINGS = [{}, {"top_k": 5}, {"top_k": 3}, {"prob_mass": 0.95}, {"prob_mass": 0.9}]
+
+
+def print_report(name: str, params: dict, report: dict):
+    print(
+        f"{name:>18} {str(params):>20} | "
+        f"memory {report['bytes_before'] / 1024:8.1f} -> {report['bytes_after'] / 1024:8.1f} KiB | "
+        f"sampling {report['sampler_before']} {report['sample_seconds_before']:.3f} -> "
+        f"{report['sampler_after']} {report['sample_seconds_after']:.3f} s | "
+        f"candidates {report['candidates_before']:>6} -> {report['candidates_after']:>6} | "
+        f"TV mean {report['mean_tv_distance']:.4f} max {report['max_tv_distance']:.4f}")
+
+
+def main(correct_texts_path: str = None, error_texts_path: str = None):
+    dir_path = os.path.join(os.path.dirname(
+        os.path.abspath(__file__)), "..", "augmentex", "static_data")
+    for lang in ["rus", "eng"]:
+        for platform in ["pc", "mobile"]:
+            with open(os.path.join(dir_path, lang, platform, "orfo_chars.json"), encoding="utf-8") as f:
+                statistic = json.load(f)
+            for params in SETTINGS:
+                print_report(f"{lang}/{platform} chars", params, compaction_report(
+                    statistic, compact_char_statistic(statistic, **params)))
+
+    if correct_texts_path is not None:
+        cs = ComputeStatistic(correct_texts_path, error_texts_path, "eng")
+        for name, statistic in zip(["words", "ngrams"], cs.compute_word_statistic()):
+            for params in SETTINGS:
+                print_report(name, params, compaction_report(
+                    statistic, compact_word_statistic(statistic, **params)))
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:3])
@@ -0,0 +1,49 @@
+"""Measures ComputeStatistic on a corpus with and without repeated pairs of texts.
+
+The corpus is generated with CharAug from random English words.
+
+Usage:
+    python benchmarks/compute_statistic.py
+"""
+import os
+import random
+import tempfile
+import time
+
+from augmentex import CharAug
+from augmentex.preprocessor import ComputeStatistic
+
+WORDS = ["screw", "you", "guys", "going", "home", "quick", "brown", "fox",
+         "jumps", "over", "lazy", "dog", "because", "from", "then", "away"]
+
+
+def write_corpus(path: str, texts, idxs) -> None:
+    with open(path, "w") as f:
+        f.writelines(texts[i] + "\n" for i in idxs)
+
+
+def main(unique: int = 10000, size: int = 200000):
+    rng = random.Random(0)
+    aug = CharAug(lang="eng", unit_prob=0.05, max_aug=3, random_seed=0)
+    correct = [" ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 12)))
+               for _ in range(unique)]
+    error = [aug.augment(text) for text in correct]
+
+    with tempfile.TemporaryDirectory() as dir_path:
+        for name, idxs in [("unique", range(unique)),
+                           ("repeated", [rng.randrange(unique) for _ in range(size)])]:
+            correct_path = os.path.join(dir_path, f"{name}_correct.txt")
+            error_path = os.path.join(dir_path, f"{name}_error.txt")
+            write_corpus(correct_path, correct, idxs)
+            write_corpus(error_path, error, idxs)
+
+            cs = ComputeStatistic(correct_path, error_path, "eng")
+            start = time.perf_counter()
+            cs.compute_char_statistic()
+            cs.compute_word_statistic()
+            print(
+                f"{name:>8}: {len(idxs)} lines, {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Compares the edit log of aug_batch with re-diffing its output by Levenshtein.editops.
+
+The edit log is collected in flat lists for the whole batch and turned into arrays once,
+so its cost grows with the number of edits, while the cost of a diff grows with the text length.
+On short texts both cost about the same, on long ones the log is much cheaper.
+The log also keeps the action of each edit, which a diff cannot recover.
+
+Usage:
+    python benchmarks/edit_log.py
+"""
+import time
+
+import Levenshtein as levenshtein
+
+from augmentex import CharAug
+
+TEXT = "Screw you guys, I am going home. (c) "
+
+
+def diffed(aug: CharAug, batch) -> float:
+    start = time.perf_counter()
+    aug_batch = aug.aug_batch(batch)
+    for text, aug_text in zip(batch, aug_batch):
+        levenshtein.editops(text, aug_text)
+
+    return time.perf_counter() - start
+
+
+def logged(aug: CharAug, batch) -> float:
+    start = time.perf_counter()
+    aug.aug_batch(batch, return_edits=True)
+
+    return time.perf_counter() - start
+
+
+def main(repeats: int = 5):
+    for repeat, size in [(1, 20000), (30, 1000), (300, 100)]:
+        batch = [TEXT * repeat] * size
+        aug = CharAug(lang="eng", random_seed=42)
+        diff_time, log_time = float("inf"), float("inf")
+        for _ in range(repeats):
+            diff_time = min(diff_time, diffed(aug, batch))
+            log_time = min(log_time, logged(aug, batch))
+        print(
+            f"text length {len(batch[0]):>6}: augment + editops {size / diff_time:>9,.0f} texts/s, "
+            f"augment + edit log {size / log_time:>9,.0f} texts/s")
+
+
+if __name__ == "__main__":
+    main()
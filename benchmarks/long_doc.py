@@ -0,0 +1,32 @@
+"""Measures the cost of CharAug.augment against the document length.
+
+With few edits the cost should barely depend on the length of the document.
+
+Usage:
+    python benchmarks/long_doc.py
+"""
+import time
+
+from augmentex import CharAug
+
+TEXT = "Screw you guys, I am going home. (c) "
+
+
+def main(repeats: int = 200):
+    for backend in ["python", "numba"]:
+        for max_aug in [5, 500]:
+            aug = CharAug(unit_prob=0.3, max_aug=max_aug, lang="eng",
+                          backend=backend, random_seed=42)
+            aug.augment(TEXT)
+            for repeat in [1, 30, 3000]:
+                text = TEXT * repeat
+                start = time.perf_counter()
+                for _ in range(repeats):
+                    aug.augment(text, action="typo")
+                elapsed = (time.perf_counter() - start) / repeats
+                print(
+                    f"backend={backend:>6} max_aug={max_aug:>3} length={len(text):>6}: {elapsed * 1e6:8.1f} us/text")
+
+
+if __name__ == "__main__":
+    main()
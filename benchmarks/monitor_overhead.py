@@ -0,0 +1,42 @@
+"""Measures the throughput cost of AugMonitor.
+
+Runs with and without the monitor are interleaved and the best of several runs
+is taken, so that machine noise affects both sides equally. Both a single random
+action per text and a mix of actions per position are measured.
+
+Usage:
+    python benchmarks/monitor_overhead.py
+"""
+import time
+
+from augmentex import AugMonitor, CharAug
+
+TEXT = "Screw you guys, I am going home. (c)"
+
+
+def elapsed(aug: CharAug, batch) -> float:
+    start = time.perf_counter()
+    aug.aug_batch(batch)
+
+    return time.perf_counter() - start
+
+
+def main(repeats: int = 15):
+    batch = [TEXT] * 20000
+    for name, action_weights in [("single", None), ("mix", {"typo": 1, "swap": 1, "insert": 1})]:
+        for sample_rate in [0.001, 0.01, 0.1, 1.0]:
+            base_aug = CharAug(lang="eng", random_seed=42,
+                               action_weights=action_weights)
+            monitor_aug = CharAug(lang="eng", random_seed=42, action_weights=action_weights,
+                                  monitor=AugMonitor(sample_rate=sample_rate))
+            base, monitored = float("inf"), float("inf")
+            for _ in range(repeats):
+                base = min(base, elapsed(base_aug, batch))
+                monitored = min(monitored, elapsed(monitor_aug, batch))
+            print(
+                f"{name:>6} actions, sample_rate={sample_rate}: {len(batch) / base:,.0f} -> {len(batch) / monitored:,.0f} texts/s, "
+                f"overhead {100 * (monitored - base) / base:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Load test of `augmentex serve`: many concurrent clients sending one text each.
+
+Starts the server in this process, so no separate setup is needed.
+
+Usage:
+    python benchmarks/server_load.py
+"""
+import json
+import threading
+import time
+import urllib.request
+
+from augmentex.server import AugPool, MicroBatcher, make_server
+
+TEXT = "Screw you guys, I am going home. (c)"
+
+
+def client(url: str, n_requests: int) -> None:
+    body = json.dumps({"text": TEXT, "lang": "eng"}).encode("utf-8")
+    for _ in range(n_requests):
+        with urllib.request.urlopen(urllib.request.Request(url, data=body)) as response:
+            json.loads(response.read())
+
+
+def main(n_clients: int = 32, n_requests: int = 100):
+    for max_latency in [0.0, 0.002, 0.01]:
+        batcher = MicroBatcher(AugPool(), max_latency=max_latency)
+        server = make_server(batcher, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/augment"
+
+        start = time.perf_counter()
+        clients = [threading.Thread(target=client, args=(url, n_requests))
+                   for _ in range(n_clients)]
+        for thread in clients:
+            thread.start()
+        for thread in clients:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        stats = batcher.stats()
+        print(
+            f"max_latency={max_latency * 1000:.0f}ms: {n_clients * n_requests / elapsed:,.0f} requests/s, "
+            f"mean batch {stats['mean_batch_size']:.1f}, latency p50 {stats['latency_p50_ms']:.2f}ms "
+            f"p99 {stats['latency_p99_ms']:.2f}ms")
+        server.shutdown()
+        server.server_close()
+        batcher.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Measures aug_batch scaling with num_threads and checks that the result is reproducible.
+
+With the GIL, the python backend does not scale. The numba backend releases the
+GIL inside its kernels and scales with long texts. On free-threaded builds both do.
+
+Usage:
+    python benchmarks/thread_batch.py
+"""
+import sysconfig
+import time
+
+from augmentex import CharAug
+
+TEXT = "Screw you guys, I am going home. (c) "
+
+
+def main():
+    print(f"free-threaded: {bool(sysconfig.get_config_var('Py_GIL_DISABLED'))}")
+    batch = [TEXT * 300] * 400
+    for backend in ["python", "numba"]:
+        CharAug(lang="eng", backend=backend).augment(TEXT)
+        for num_threads in [1, 2, 4, 8]:
+            aug = CharAug(unit_prob=0.3, max_aug=10 ** 6, lang="eng",
+                          backend=backend, random_seed=42)
+            start = time.perf_counter()
+            result = aug.aug_batch(batch, action="typo",
+                                   num_threads=num_threads)
+            elapsed = time.perf_counter() - start
+
+            aug = CharAug(unit_prob=0.3, max_aug=10 ** 6, lang="eng",
+                          backend=backend, random_seed=42)
+            assert result == aug.aug_batch(
+                batch, action="typo", num_threads=num_threads)
+            print(
+                f"backend={backend:>6} num_threads={num_threads} time={elapsed:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
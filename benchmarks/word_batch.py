@@ -0,0 +1,34 @@
+"""Compares the batched WordAug.aug_batch with augmenting lines one by one.
+
+WordAug needs orfo_words.json/orfo_ngrams.json statistics, so pass your own parallel corpora.
+
+Usage:
+    python benchmarks/word_batch.py correct_texts.txt error_texts.txt
+"""
+import sys
+import time
+
+from augmentex import WordAug
+from augmentex.base import BaseAug
+
+TEXT = "Screw you guys, I am going home. (c) the quick brown fox"
+
+
+def main(correct_texts_path: str, error_texts_path: str):
+    aug = WordAug(lang="eng", random_seed=42, correct_texts_path=correct_texts_path,
+                  error_texts_path=error_texts_path)
+    batch = [TEXT] * 50000
+    for action in [None, "swap", "stopword", "reverse", "delete"]:
+        start = time.perf_counter()
+        BaseAug.aug_batch(aug, batch, action=action)
+        line_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        aug.aug_batch(batch, action=action)
+        batch_time = time.perf_counter() - start
+        print(
+            f"action={str(action):>8} one by one={line_time:.3f}s batched={batch_time:.3f}s x{line_time / batch_time:.1f}")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:3])
@@ -27,6 +27,8 @@ setup(
     ],
     python_requires=">=3.7.0",
     install_requires=["numpy>=1.21", "python-Levenshtein>=0.22.0"],
+    extras_require={"numba": ["numba>=0.56"], "arrow": ["pyarrow>=7.0"]},
+    entry_points={"console_scripts": ["augmentex=augmentex.__main__:main"]},
     keywords="augmentex errors typos nlp augmentation",
     zip_safe=False,
 )
\ No newline at end of file
@@ -0,0 +1,13 @@
+import pytest
+
+
+@pytest.fixture(scope="session")
+def corpus(tmp_path_factory):
+    dir_path = tmp_path_factory.mktemp("corpus")
+    correct = ["привет как дела", "скажи мне что нибудь", "ну и ладно тогда"] * 5
+    error = ["привет как дила", "скожи мне что нибуть", "ну и ладна тогда"] * 5
+    (dir_path / "correct.txt").write_text("\n".join(correct) + "\n", encoding="utf-8")
+    (dir_path / "error.txt").write_text("\n".join(error) + "\n", encoding="utf-8")
+
+    return {"correct_texts_path": str(dir_path / "correct.txt"),
+            "error_texts_path": str(dir_path / "error.txt")}
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from augmentex import CharAug
+from augmentex.arrays import replace_rows, take_rows
+
+TEXTS = ["Screw you guys", "I am going home", "ok", "Hello world"] * 5
+
+
+def augmented(batch, **kwargs):
+    return CharAug(lang="eng", random_seed=5).aug_batch(batch, **kwargs)
+
+
+def test_list_batch():
+    aug_batch = augmented(list(TEXTS))
+
+    assert isinstance(aug_batch, list)
+    assert aug_batch == augmented(np.array(TEXTS, dtype=object)).tolist()
+
+
+@pytest.mark.parametrize("dtype", ["U", object])
+def test_numpy_batch(dtype):
+    batch = np.array(TEXTS, dtype=dtype)
+    aug_batch = augmented(batch)
+
+    assert isinstance(aug_batch, np.ndarray) and aug_batch.dtype.kind == batch.dtype.kind
+    assert aug_batch.tolist() == augmented(list(TEXTS))
+
+
+def test_numpy_batch_is_widened():
+    aug_batch = replace_rows(np.array(["ab", "cd"]), [1], ["a much longer line"])
+
+    assert aug_batch.tolist() == ["ab", "a much longer line"]
+
+
+def test_missing_rows_are_kept():
+    batch = list(TEXTS) + [None]
+    aug_batch = augmented(batch)
+
+    assert aug_batch[-1] is None
+    assert aug_batch == augmented(np.array(batch, dtype=object)).tolist()
+    assert take_rows(batch, [0, len(TEXTS)]) == ([0], [TEXTS[0]])
+
+
+def test_bad_numpy_batch():
+    with pytest.raises(ValueError):
+        augmented(np.zeros(3))
+
+
+@pytest.mark.parametrize("type_name", ["string", "large_string", "string_view"])
+def test_arrow_batch(type_name):
+    pa = pytest.importorskip("pyarrow")
+    if not hasattr(pa, type_name):
+        pytest.skip(f"pyarrow has no {type_name}")
+    data_type = getattr(pa, type_name)()
+    batch = pa.array(TEXTS + [None], type=data_type)
+    aug_batch = augmented(batch)
+
+    assert aug_batch.type == data_type
+    assert aug_batch.to_pylist() == augmented(list(TEXTS) + [None])
+
+
+@pytest.mark.parametrize("type_name", ["string", "string_view"])
+def test_arrow_chunked_batch(type_name):
+    pa = pytest.importorskip("pyarrow")
+    if not hasattr(pa, type_name):
+        pytest.skip(f"pyarrow has no {type_name}")
+    data_type = getattr(pa, type_name)()
+    chunks = [pa.array(TEXTS[:7], type=data_type), pa.array([None] * 3, type=data_type),
+              pa.array(TEXTS[7:], type=data_type)]
+    batch = pa.chunked_array(chunks, type=data_type)
+    aug_batch = augmented(batch, batch_prob=0.5)
+
+    assert isinstance(aug_batch, pa.ChunkedArray) and aug_batch.type == data_type
+    assert [len(chunk) for chunk in aug_batch.chunks] == [7, 3, len(TEXTS) - 7]
+    assert aug_batch.to_pylist() == augmented(batch.to_pylist(), batch_prob=0.5)
+
+
+def test_arrow_batch_of_numbers():
+    pa = pytest.importorskip("pyarrow")
+
+    with pytest.raises(ValueError):
+        augmented(pa.array([1, 2, 3]))
@@ -0,0 +1,55 @@
+import warnings
+
+import pytest
+
+from augmentex import CharAug, kernels
+from augmentex.variables import CHAR_ACTIONS
+
+TEXTS = [
+    "Привет как дела у тебя сегодня вечером",
+    "Скажи мне что нибудь хорошее!!!",
+    "ну и ладно, тогда пока :)",
+    "Screw you guys, I am going home. (c)",
+    "ab\udcffcd",
+    "",
+    "a",
+] * 10
+
+MIXES = [
+    {"typo": 1, "swap": 1},
+    {"orfo": 2, "insert": 1, "delete": 1},
+    {action: 1 for action in CHAR_ACTIONS},
+]
+
+numba_only = pytest.mark.skipif(
+    not kernels.NUMBA_AVAILABLE, reason="numba is not installed")
+
+
+@numba_only
+@pytest.mark.parametrize("lang", ["rus", "eng"])
+@pytest.mark.parametrize("action", CHAR_ACTIONS + MIXES)
+def test_numba_matches_python(lang, action):
+    outputs = {}
+    for backend in ["python", "numba"]:
+        aug = CharAug(backend=backend, lang=lang, random_seed=11, max_aug=10)
+        assert aug.backend == backend
+        outputs[backend] = aug.aug_batch(TEXTS, action=action)
+
+    assert outputs["numba"] == outputs["python"]
+
+
+@numba_only
+def test_numba_compile_failure_falls_back_to_python(monkeypatch):
+    def broken_kernel():
+        def kernel(*args):
+            raise TypeError("cannot type the kernel")
+        return kernel
+
+    monkeypatch.setattr(kernels, "_load_kernel", broken_kernel)
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        aug = CharAug(backend="numba", random_seed=1)
+
+    assert aug.backend == "python"
+    assert any("Falling back" in str(warning.message) for warning in caught)
+    assert isinstance(aug.augment("Привет мама", "typo"), str)
@@ -0,0 +1,42 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+import augmentex
+from augmentex.compaction import compact_char_statistic, compact_word_statistic, compaction_report
+
+STATIC_DATA = os.path.join(os.path.dirname(augmentex.__file__), "static_data")
+
+
+@pytest.fixture(scope="module")
+def char_statistic():
+    with open(os.path.join(STATIC_DATA, "eng", "pc", "orfo_chars.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_char_report_times_the_sampler_of_each_format(char_statistic):
+    report = compaction_report(char_statistic, compact_char_statistic(char_statistic, top_k=3), n_draws=500)
+
+    assert report["sampler_before"] == "choice" and report["sampler_after"] == "cdf"
+    assert report["bytes_after"] < report["bytes_before"]
+    assert report["candidates_after"] < report["candidates_before"]
+    assert 0 < report["max_tv_distance"] <= 1
+
+
+def test_lossless_char_compaction(char_statistic):
+    report = compaction_report(char_statistic, compact_char_statistic(char_statistic), n_draws=100)
+
+    assert report["candidates_after"] == report["candidates_before"]
+    assert report["max_tv_distance"] == pytest.approx(0.0, abs=1e-12)
+
+
+def test_word_report():
+    statistic = {"cat": [["cat", "kat", "cta"], [0.7, 0.2, 0.1]], "dog": [["dog", "dgo"], [0.9, 0.1]]}
+    compacted = compact_word_statistic(statistic, top_k=1)
+    report = compaction_report(statistic, compacted, n_draws=100)
+
+    assert compacted["cat"][0] == ("cat",) and np.allclose(compacted["cat"][1], [1.0])
+    assert report["sampler_before"] == report["sampler_after"] == "choice"
+    assert report["max_tv_distance"] == pytest.approx(0.3)
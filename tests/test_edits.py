@@ -0,0 +1,33 @@
+import numpy as np
+
+from augmentex import CharAug
+
+TEXTS = ["Screw you guys, I am going home.", "", "ok", "Hello world"] * 10
+
+
+def test_batch_edit_log_is_sorted_by_line():
+    aug = CharAug(lang="eng", random_seed=1)
+    _, edits = aug.aug_batch(TEXTS, return_edits=True)
+
+    assert (np.diff(edits["line"]) >= 0).all()
+    assert len({len(values) for values in edits.values()}) == 1
+
+
+def test_batch_edit_log_matches_augment():
+    aug_batch, edits = CharAug(lang="eng", random_seed=1).aug_batch(TEXTS, return_edits=True)
+
+    for line, (text, aug_text) in enumerate(zip(TEXTS, aug_batch)):
+        mask = edits["line"] == line
+        chars = list(text)
+        for position, replacement in zip(edits["position"][mask], edits["replacement"][mask]):
+            chars[position] = replacement
+        assert "".join(chars) == aug_text
+
+
+def test_augment_edit_log_arrays():
+    aug_text, edits = CharAug(lang="eng", random_seed=1).augment(TEXTS[0], action="typo", return_edits=True)
+
+    assert set(edits) == {"position", "original", "replacement", "action"}
+    assert edits["position"].dtype == np.int64
+    assert list(edits["action"]) == ["typo"] * len(edits["position"])
+    assert all(type(action) is str for action in edits["action"])
@@ -0,0 +1,30 @@
+from augmentex import AugMonitor, CharAug
+
+TEXTS = ["Screw you guys, I am going home."] * 50
+
+
+def test_mix_is_keyed_by_applied_actions():
+    monitor = AugMonitor(sample_rate=1.0, random_seed=0)
+    aug = CharAug(lang="eng", random_seed=0, monitor=monitor,
+                  action_weights={"typo": 1, "swap": 1})
+    aug.aug_batch(TEXTS)
+
+    keys = {action for action, _ in monitor.histograms()}
+    assert keys <= {"typo", "swap", "typo+swap"}
+    assert "typo+swap" in keys
+
+
+def test_key_is_built_only_for_sampled_texts():
+    calls = []
+
+    def key():
+        calls.append(1)
+        return "typo"
+
+    monitor = AugMonitor(sample_rate=0.0)
+    monitor.observe("text", "tetx", key, "eng")
+    assert calls == [] and monitor.histograms() == {}
+
+    monitor = AugMonitor(sample_rate=1.0)
+    monitor.observe("text", "tetx", key, "eng")
+    assert calls == [1] and list(monitor.histograms()) == [("typo", "eng")]
@@ -0,0 +1,149 @@
+import http.client
+import json
+import os
+import socket
+import threading
+import time
+
+import pytest
+
+from augmentex import WordAug, server as aug_server
+from augmentex.server import AugPool, MicroBatcher, make_server
+
+
+@pytest.fixture
+def batcher():
+    batcher = MicroBatcher(AugPool(random_seed=0), max_latency=0.001)
+    yield batcher
+    batcher.close()
+
+
+@pytest.fixture
+def http_server(batcher):
+    server = make_server(batcher, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    def request(method, path, body=None):
+        connection = http.client.HTTPConnection(*server.server_address[:2], timeout=10)
+        connection.request(method, path, body=None if body is None else json.dumps(body))
+        response = connection.getresponse()
+        data = json.loads(response.read())
+        connection.close()
+        return response.status, data
+
+    yield request
+    server.shutdown()
+    server.server_close()
+
+
+def test_concurrent_requests_are_merged_into_batches():
+    batcher = MicroBatcher(AugPool(random_seed=0), max_batch_size=64, max_latency=0.2)
+    results = {}
+
+    def target(i):
+        results[i] = batcher.submit([f"привет мама {i}"] * 2, action="typo")
+
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = batcher.stats()
+    batcher.close()
+
+    assert sorted(results) == list(range(16))
+    assert all(len(texts) == 2 for texts in results.values())
+    assert stats["requests"] == 16 and stats["texts"] == 32
+    assert stats["batches"] < 16 and stats["mean_batch_size"] > 2
+
+
+def test_http_endpoints(http_server):
+    assert http_server("GET", "/health") == (200, {"status": "ok"})
+
+    status, data = http_server("POST", "/augment", {"texts": ["привет мама", "как дела"], "action": "typo"})
+    assert status == 200 and len(data["texts"]) == 2
+
+    status, data = http_server("POST", "/augment", {"text": "hello there", "lang": "eng"})
+    assert status == 200 and len(data["texts"]) == 1
+
+    status, stats = http_server("GET", "/stats")
+    assert status == 200
+    assert stats["requests"] == 2 and stats["texts"] == 3
+    assert 0 < stats["recent_texts_per_second"] <= stats["texts"] / stats["uptime"] * 1.01
+
+    assert http_server("GET", "/nothing")[0] == 404
+
+
+@pytest.mark.parametrize("body", [
+    {"texts": "not a list"},
+    {"texts": ["a b"], "level": "sentence"},
+    {"texts": ["a b"], "action": "nothing"},
+    {"texts": ["a b"], "lang": "xx"},
+])
+def test_bad_requests_get_400(http_server, body):
+    status, data = http_server("POST", "/augment", body)
+
+    assert status == 400 and "error" in data
+
+
+def test_missing_statistics_get_500_without_reloading(http_server, monkeypatch):
+    loads = []
+
+    class CountingWordAug(WordAug):
+        def __init__(self, **kwargs):
+            loads.append(kwargs)
+            raise FileNotFoundError("orfo_words.json")
+
+    monkeypatch.setitem(aug_server.AUG_LEVELS, "word", CountingWordAug)
+    for _ in range(3):
+        status, data = http_server("POST", "/augment", {"texts": ["a b"], "level": "word"})
+        assert status == 500 and "orfo_words.json" in data["error"]
+
+    assert len(loads) == 1
+
+
+def test_recent_throughput_of_a_young_server(batcher):
+    batcher.submit(["привет мама"] * 10)
+    time.sleep(0.05)
+    stats = batcher.stats()
+
+    assert stats["recent_texts_per_second"] == pytest.approx(10 / stats["uptime"], rel=0.5)
+
+
+def test_submit_after_close_is_rejected(batcher):
+    assert len(batcher.submit(["привет мама"])) == 1
+
+    batcher.close()
+
+    with pytest.raises(RuntimeError):
+        batcher.submit(["привет мама"])
+
+
+def test_unix_socket_of_running_server_is_not_taken_over(batcher, tmp_path):
+    path = str(tmp_path / "aug.sock")
+    server = make_server(batcher, unix_socket=path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        with pytest.raises(OSError, match="in use"):
+            make_server(batcher, unix_socket=path)
+        assert os.path.exists(path)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(path)
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert not os.path.exists(path)
+
+
+def test_stale_unix_socket_is_replaced(batcher, tmp_path):
+    path = str(tmp_path / "aug.sock")
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(path)
+    stale.close()
+
+    server = make_server(batcher, unix_socket=path)
+    server.server_close()
+
+    assert not os.path.exists(path)
@@ -0,0 +1,100 @@
+import copy
+import pickle
+import threading
+
+import pytest
+
+from augmentex import CharAug, WordAug
+from augmentex.kernels import NUMBA_AVAILABLE
+
+TEXTS = [
+    "Привет как дела у тебя сегодня вечером",
+    "Скажи мне что нибудь хорошее",
+    "ну и ладно тогда пока",
+] * 20
+
+BACKENDS = ["python"] + (["numba"] if NUMBA_AVAILABLE else [])
+
+
+def run_in_threads(target, num_threads=8):
+    errors = []
+
+    def worker():
+        try:
+            target()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(num_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return errors
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_char_aug_shared_between_threads(backend):
+    aug = CharAug(backend=backend, random_seed=42,
+                  action_weights={"typo": 1, "swap": 1, "insert": 1})
+    results = []
+
+    def target():
+        for text in TEXTS:
+            results.append(aug.augment(text))
+        results.extend(aug.aug_batch(TEXTS))
+
+    assert run_in_threads(target) == []
+    assert len(results) == 8 * 2 * len(TEXTS)
+    assert all(isinstance(result, str) for result in results)
+
+
+def test_word_aug_shared_between_threads(corpus):
+    aug = WordAug(random_seed=42, **corpus)
+    results = []
+
+    def target():
+        for text in TEXTS:
+            results.append(aug.augment(text, action="replace"))
+        results.extend(aug.aug_batch(TEXTS, action="swap"))
+
+    assert run_in_threads(target) == []
+    assert len(results) == 8 * 2 * len(TEXTS)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("num_threads", [1, 2, 4])
+def test_char_aug_batch_is_reproducible(backend, num_threads):
+    results = [CharAug(backend=backend, random_seed=7).aug_batch(TEXTS, num_threads=num_threads)
+               for _ in range(2)]
+
+    assert results[0] == results[1]
+    assert results[0] != TEXTS
+
+
+@pytest.mark.parametrize("num_threads", [1, 2, 4])
+def test_word_aug_batch_is_reproducible(corpus, num_threads):
+    results = [WordAug(random_seed=7, **corpus).aug_batch(TEXTS, action="swap", num_threads=num_threads)
+               for _ in range(2)]
+
+    assert results[0] == results[1]
+
+
+@pytest.mark.parametrize("round_trip", [lambda aug: pickle.loads(pickle.dumps(aug)), copy.deepcopy])
+def test_char_aug_round_trip(round_trip):
+    aug = CharAug(random_seed=3, action_weights={"typo": 1, "swap": 2})
+    restored = round_trip(aug)
+
+    assert restored.action_weights == {"typo": 1, "swap": 2}
+    assert restored.aug_batch(TEXTS) == CharAug(
+        random_seed=3, action_weights={"typo": 1, "swap": 2}).aug_batch(TEXTS)
+    assert run_in_threads(lambda: restored.aug_batch(TEXTS, num_threads=2)) == []
+
+
+@pytest.mark.parametrize("round_trip", [lambda aug: pickle.loads(pickle.dumps(aug)), copy.deepcopy])
+def test_word_aug_round_trip(corpus, round_trip):
+    restored = round_trip(WordAug(random_seed=3, **corpus))
+
+    assert restored.aug_batch(TEXTS, action="replace") == WordAug(
+        random_seed=3, **corpus).aug_batch(TEXTS, action="replace")
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from augmentex import WordAug
+
+
+@pytest.mark.parametrize("num_threads", [1, 2])
+def test_swap_on_short_lines_is_a_noop_in_batch(corpus, num_threads):
+    aug = WordAug(random_seed=0, **corpus)
+    batch = ["кот", "", "привет мама"]
+
+    aug_batch = aug.aug_batch(batch, action="swap", num_threads=num_threads)
+
+    assert aug_batch[:2] == ["кот", ""]
+    assert sorted(aug_batch[2].split()) == ["мама", "привет"]
+
+
+def test_swap_on_short_lines_is_a_noop_in_augment(corpus):
+    aug = WordAug(random_seed=0, **corpus)
+
+    assert aug.augment("кот", action="swap") == "кот"
+    assert aug.augment("", action="swap") == ""
+
+
+@pytest.mark.parametrize("num_threads", [1, 2])
+def test_edit_log_actions_are_str(corpus, num_threads):
+    aug = WordAug(random_seed=0, **corpus)
+    _, edits = aug.aug_batch(["привет как дела у тебя", "скажи мне что нибудь"] * 10,
+                             num_threads=num_threads, return_edits=True)
+
+    assert len(edits["action"]) > 0
+    assert all(type(action) is str for action in edits["action"])
+    assert (np.diff(edits["line"]) >= 0).all()